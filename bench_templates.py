@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: compiled templates vs. repeated str.replace passes.
+Fills the real template files from TEMPLATE_CONFIGS with a sample row and checks
+that both approaches produce identical output.
+
+Usage: python3 bench_templates.py [iterations]
+"""
+
+import sys
+import timeit
+
+from mailer_dual_template import TEMPLATE_CONFIGS, get_compiled_template
+
+SAMPLE_VALUES = {
+    'Name': 'Jane Doe',
+    'Email': 'jane.doe@example.com',
+    'OrgName': 'IEEE BAU',
+    'EventName': 'Intro to Embedded Systems',
+    'EventTitle': 'Intro to Embedded Systems',
+    'EventDate': '2024-05-18',
+    'EventTime': '18:00',
+    'EventTimezone': 'EET',
+    'EventLocation': 'Main Campus, Hall B',
+    'EventDescription': 'A hands-on session on microcontrollers.',
+    'RSVP_URL': 'https://example.com/rsvp',
+    'CalendarICSURL': 'https://example.com/event.ics',
+    'SupportEmail': 'IEEE.BAU.LB@gmail.com',
+    'Year': '2024',
+    'TeamOrSignerName': 'Mohamad Al Ghoush',
+    'Title': 'Chair',
+    'ThankYouMessage': 'Thank you for attending.',
+    'ThankYouMessagePlain': 'Thank you for attending.',
+    'AttachmentLine': 'Your certificate is attached.',
+    'AttachmentLinePlain': 'Your certificate is attached.',
+    'EventDetailsSection': '<table><tr><td>Details</td></tr></table>',
+    'EventDetailsBlock': 'EVENT DETAILS\n',
+    'ResourcesSection': '',
+    'ResourcesBlock': '',
+    'FeedbackSection': '',
+    'FeedbackBlock': '',
+    'FooterContact': 'IEEE.BAU.LB@gmail.com',
+    'FooterContactText': 'IEEE.BAU.LB@gmail.com',
+    'HeroImageSection': '',
+    'OutcomesSection': '<ul><li>Outcome</li></ul>',
+    'OutcomesText': 'KEY OUTCOMES\n- Outcome\n',
+    'SpeakersSection': '',
+    'SpeakersText': '',
+    'UnsubscribeSection': '',
+    'UnsubscribeText': '',
+}
+
+
+def replace_render(template: str, values: dict) -> str:
+    """The previous approach: one full-template str.replace per field."""
+    for key, value in values.items():
+        template = template.replace(f'{{{key}}}', str(value))
+    return template
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    print(f"{'Template':<22}{'str.replace':>14}{'compiled':>12}{'speed-up':>11}")
+    for template_key in TEMPLATE_CONFIGS:
+        for part in ('html', 'text'):
+            compiled = get_compiled_template(template_key, part)
+            source = compiled.source
+
+            if replace_render(source, SAMPLE_VALUES) != compiled.render(SAMPLE_VALUES):
+                print(f"{template_key}/{part}: OUTPUT MISMATCH")
+                sys.exit(1)
+
+            old = timeit.timeit(lambda: replace_render(source, SAMPLE_VALUES), number=iterations)
+            new = timeit.timeit(lambda: compiled.render(SAMPLE_VALUES), number=iterations)
+            print(f"{template_key + '/' + part:<22}{old / iterations * 1e6:>12.1f}us"
+                  f"{new / iterations * 1e6:>10.1f}us{old / new:>10.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Gmail and Sheets endpoints used by mailer_dual_template.py,
+for load-testing without a Google account.
+
+Implements spreadsheets.get, spreadsheets.values.get, spreadsheets.values.batchGet,
+Drive files.get (modifiedTime only) and users.messages.send
+(JSON, media upload, resumable upload and batch requests) on a single base URL.
+The sheet is synthetic: a header row plus --rows generated recipients.
+Latency, 429/5xx injection and send quotas are configurable. Send counts,
+status codes and bytes received and sent are printed on exit and served at /stats.
+
+Usage:
+    python3 fake_google_api.py --rows 10000 --latency lognormal:80:0.5 --error-429 0.02
+    MAILER_API_BASE_URL=http://127.0.0.1:8089 python3 mailer_dual_template.py
+
+Latency specs (milliseconds): none, fixed:MS, uniform:LO:HI, normal:MEAN:SD,
+lognormal:MEDIAN:SIGMA
+"""
+
+import argparse
+import json
+import math
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter, deque
+from email.parser import BytesParser
+from itertools import zip_longest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+
+SHEET_TITLE = 'Sheet1'
+
+SEND_PATH = re.compile(r'/gmail/v1/users/[^/]+/messages/send')
+UPLOAD_PATH = re.compile(r'(/resumable)?/upload/gmail/v1/users/[^/]+/messages/send')
+
+SHEET_COLUMNS = ['Name', 'Email', 'OrgName', 'EventName', 'CompletionDate',
+                 'EventTitle', 'EventDate', 'EventTime', 'EventTimezone', 'EventLocation',
+                 'EventDescription', 'RSVP_URL', 'CalendarICSURL', 'SupportEmail', 'Year']
+
+FIRST_NAMES = ['Jane', 'Omar', 'Lina', 'Karim', 'Maya', 'Sami', 'Rana', 'Hadi', 'Nour', 'Ziad']
+LAST_NAMES = ['Haddad', 'Khoury', 'Saleh', 'Nasser', 'Fares', 'Daher', 'Aoun', 'Mansour']
+
+
+class LatencyModel:
+    """Draws per-request latency (seconds) from a distribution spec."""
+
+    def __init__(self, spec: str):
+        parts = spec.split(':')
+        self.kind = parts[0]
+        self.params = [float(p) for p in parts[1:]]
+        expected = {'none': 0, 'fixed': 1, 'uniform': 2, 'normal': 2, 'lognormal': 2}
+        if self.kind not in expected or len(self.params) != expected[self.kind]:
+            raise ValueError(f"Invalid latency spec: {spec}")
+
+    def sample(self) -> float:
+        if self.kind == 'none':
+            return 0.0
+        if self.kind == 'fixed':
+            milliseconds = self.params[0]
+        elif self.kind == 'uniform':
+            milliseconds = random.uniform(*self.params)
+        elif self.kind == 'normal':
+            milliseconds = max(0.0, random.gauss(*self.params))
+        else:
+            median, sigma = self.params
+            milliseconds = random.lognormvariate(math.log(median), sigma)
+        return milliseconds / 1000
+
+
+class SendQuota:
+    """Per-second and total limits on messages.send calls."""
+
+    def __init__(self, per_second=None, total=None):
+        self.per_second = per_second
+        self.total = total
+        self.used = 0
+        self._window = deque()
+        self._lock = threading.Lock()
+
+    def check(self):
+        """Return None if the send is allowed, else (status, reason, message, retry_after)."""
+        with self._lock:
+            now = time.monotonic()
+            if self.total is not None and self.used >= self.total:
+                return 403, 'dailyLimitExceeded', 'Daily sending quota exceeded.', None
+            if self.per_second is not None:
+                while self._window and now - self._window[0] >= 1.0:
+                    self._window.popleft()
+                if len(self._window) >= self.per_second:
+                    return 429, 'rateLimitExceeded', 'User-rate limit exceeded.', 1
+                self._window.append(now)
+            self.used += 1
+            return None
+
+
+class FakeGoogleApi:
+    """Shared state behind the request handler: sheet data, faults, quota and stats."""
+
+    def __init__(self, rows: int, latency: LatencyModel, error_429: float, error_5xx: float,
+                 quota: SendQuota):
+        self.rows = rows
+        self.latency = latency
+        self.error_429 = error_429
+        self.error_5xx = error_5xx
+        self.quota = quota
+        self.stats = Counter()
+        self.started = time.time()
+        self._lock = threading.Lock()
+        self._next_id = 0
+
+    def count(self, key: str, amount: int = 1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def new_message_id(self) -> str:
+        with self._lock:
+            self._next_id += 1
+            return f"{self._next_id:016x}"
+
+    def row(self, index: int):
+        """Synthetic data row (0-based), deterministic per index."""
+        name = f"{FIRST_NAMES[index % len(FIRST_NAMES)]} {LAST_NAMES[index // len(FIRST_NAMES) % len(LAST_NAMES)]}"
+        return [name, f"recipient{index}@example.com", 'IEEE BAU', 'Load Test Event', '2024-05-18',
+                'Load Test Event', '2024-05-18', '18:00', 'EET', 'Main Campus, Hall B',
+                'A synthetic event for load testing.', f"https://example.com/rsvp/{index}",
+                'https://example.com/event.ics', 'support@example.com', '2024']
+
+    def values(self, range_name: str):
+        """Cells for an A1 range such as 'Sheet1', 'Sheet1!A2:O5001' or 'A:B'."""
+        if '!' in range_name:
+            cells = range_name.split('!', 1)[1]
+        else:
+            cells = '' if range_name.strip("'") == SHEET_TITLE else range_name
+        first_row, last_row = 1, self.rows + 1
+        first_col, last_col = 0, len(SHEET_COLUMNS) - 1
+        if cells:
+            start, _, end = cells.partition(':')
+            start_col, start_row = split_cell(start)
+            end_col, end_row = split_cell(end) if end else (start_col, start_row)
+            if start_col:
+                first_col = column_index(start_col)
+            if end_col:
+                last_col = column_index(end_col)
+            first_row = start_row or first_row
+            last_row = end_row or last_row
+        values = []
+        for row_number in range(first_row, min(last_row, self.rows + 1) + 1):
+            row = SHEET_COLUMNS if row_number == 1 else self.row(row_number - 2)
+            values.append(row[first_col:last_col + 1])
+        return values
+
+    def inject_fault(self):
+        """Randomly pick an injected error, or None."""
+        draw = random.random()
+        if draw < self.error_429:
+            return 429, 'rateLimitExceeded', 'User-rate limit exceeded.', 1
+        if draw < self.error_429 + self.error_5xx:
+            status = random.choice([500, 502, 503])
+            return status, 'backendError', 'Backend Error', None
+        return None
+
+    def send(self, content_length: int):
+        """Handle one messages.send. Returns (status, body_dict, headers)."""
+        self.count('bytes_received', content_length)
+        failure = self.inject_fault() or self.quota.check()
+        if failure is not None:
+            status, reason, message, retry_after = failure
+            self.count(f'send_{status}')
+            headers = {'Retry-After': str(retry_after)} if retry_after is not None else {}
+            return status, error_body(status, reason, message), headers
+        self.count('send_200')
+        message_id = self.new_message_id()
+        return 200, {'id': message_id, 'threadId': message_id, 'labelIds': ['SENT']}, {}
+
+    def summary(self):
+        elapsed = max(time.time() - self.started, 1e-9)
+        sent = self.stats['send_200']
+        return dict(self.stats, elapsed_seconds=round(elapsed, 2),
+                    sends_per_second=round(sent / elapsed, 2))
+
+
+def split_cell(cell: str):
+    """'B12' -> ('B', 12); 'B' -> ('B', None); '12' -> ('', 12)."""
+    match = re.fullmatch(r'([A-Za-z]*)(\d*)', cell)
+    if not match:
+        raise ValueError(f"Invalid cell reference: {cell}")
+    letters, digits = match.groups()
+    return letters.upper(), int(digits) if digits else None
+
+
+def column_index(letters: str) -> int:
+    index = 0
+    for letter in letters:
+        index = index * 26 + (ord(letter) - ord('A') + 1)
+    return index - 1
+
+
+def transpose(rows):
+    """Rows to columns, trimming trailing empty cells like the API does."""
+    columns = [list(column) for column in zip_longest(*rows, fillvalue='')]
+    for column in columns:
+        while column and column[-1] == '':
+            column.pop()
+    while columns and not columns[-1]:
+        columns.pop()
+    return columns
+
+
+def error_body(status: int, reason: str, message: str):
+    return {'error': {'code': status, 'message': message,
+                      'errors': [{'domain': 'global', 'reason': reason, 'message': message}]}}
+
+
+class FakeGoogleApiHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    api: FakeGoogleApi = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_body(self) -> bytes:
+        length = int(self.headers.get('Content-Length') or 0)
+        return self.rfile.read(length) if length else b''
+
+    def _respond(self, status: int, body, headers=None, content_type='application/json'):
+        data = body if isinstance(body, bytes) else json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+        self.api.count(f'http_{status}')
+        self.api.count('bytes_sent', len(data))
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        time.sleep(self.api.latency.sample())
+        if url.path == '/stats':
+            return self._respond(200, self.api.summary())
+        match = re.fullmatch(r'/drive/v3/files/([^/]+)', url.path)
+        if match:
+            self.api.count('files_get')
+            # The synthetic sheet was last modified when the server started
+            modified = time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime(self.api.started))
+            return self._respond(200, {'id': unquote(match.group(1)), 'modifiedTime': modified})
+        match = re.fullmatch(r'/v4/spreadsheets/([^/]+)/values:batchGet', url.path)
+        if match:
+            self.api.count('values_batch_get')
+            query = parse_qs(url.query)
+            major_dimension = query.get('majorDimension', ['ROWS'])[0]
+            value_ranges = []
+            for range_name in query.get('ranges', []):
+                result = {'range': range_name, 'majorDimension': major_dimension}
+                values = self.api.values(range_name)
+                if major_dimension == 'COLUMNS':
+                    values = transpose(values)
+                if values:
+                    result['values'] = values
+                value_ranges.append(result)
+            return self._respond(200, {'spreadsheetId': unquote(match.group(1)), 'valueRanges': value_ranges})
+        match = re.fullmatch(r'/v4/spreadsheets/([^/]+)/values/(.+)', url.path)
+        if match:
+            self.api.count('values_get')
+            range_name = unquote(match.group(2))
+            result = {'range': range_name, 'majorDimension': 'ROWS'}
+            values = self.api.values(range_name)
+            if values:
+                # Like the real API, an empty range has no 'values' key
+                result['values'] = values
+            return self._respond(200, result)
+        match = re.fullmatch(r'/v4/spreadsheets/([^/]+)', url.path)
+        if match:
+            self.api.count('spreadsheets_get')
+            return self._respond(200, {
+                'spreadsheetId': unquote(match.group(1)),
+                'sheets': [{'properties': {'sheetId': 0, 'title': SHEET_TITLE, 'index': 0,
+                                           'gridProperties': {'rowCount': self.api.rows + 1,
+                                                              'columnCount': len(SHEET_COLUMNS)}}}]
+            })
+        self._respond(404, error_body(404, 'notFound', 'Requested entity was not found.'))
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        body = self._read_body()
+        time.sleep(self.api.latency.sample())
+        if url.path == '/batch' or url.path.startswith('/batch/'):
+            return self._handle_batch(body)
+        upload_type = parse_qs(url.query).get('uploadType', [''])[0]
+        if upload_type == 'resumable' and UPLOAD_PATH.fullmatch(url.path):
+            # Start a resumable session; the client then PUTs the content to Location
+            host = self.headers.get('Host')
+            return self._respond(200, b'', {'Location': f"http://{host}{url.path}?upload_id=1"})
+        if UPLOAD_PATH.fullmatch(url.path) or SEND_PATH.fullmatch(url.path):
+            if upload_type:
+                self.api.count(f'send_{upload_type}_upload')
+            status, result, headers = self.api.send(len(body))
+            return self._respond(status, result, headers)
+        self._respond(404, error_body(404, 'notFound', 'Requested entity was not found.'))
+
+    def do_PUT(self):
+        url = urlparse(self.path)
+        body = self._read_body()
+        time.sleep(self.api.latency.sample())
+        if UPLOAD_PATH.fullmatch(url.path):
+            self.api.count('send_resumable_upload')
+            status, result, headers = self.api.send(len(body))
+            return self._respond(status, result, headers)
+        self._respond(404, error_body(404, 'notFound', 'Requested entity was not found.'))
+
+    def _handle_batch(self, body: bytes):
+        """Answer a multipart/mixed batch, applying faults and quota per part."""
+        self.api.count('batch_requests')
+        envelope = f"Content-Type: {self.headers.get('Content-Type')}\r\n\r\n".encode('utf-8') + body
+        parts = BytesParser().parsebytes(envelope).get_payload()
+        boundary = f"batch_{random.getrandbits(64):016x}"
+        chunks = []
+        for part in parts:
+            content_id = part.get('Content-ID', '')
+            request = part.get_payload(decode=True) or b''
+            request_body = request.split(b'\r\n\r\n', 1)[-1] if b'\r\n\r\n' in request else b''
+            status, result, headers = self.api.send(len(request_body))
+            header_lines = ''.join(f"{key}: {value}\r\n" for key, value in headers.items())
+            response = (f"HTTP/1.1 {status} {self.responses.get(status, ('',))[0]}\r\n"
+                        f"Content-Type: application/json\r\n{header_lines}\r\n{json.dumps(result)}")
+            chunks.append(f"--{boundary}\r\nContent-Type: application/http\r\n"
+                          f"Content-ID: <response-{content_id.strip('<>')}>\r\n\r\n{response}\r\n")
+        data = (''.join(chunks) + f"--{boundary}--\r\n").encode('utf-8')
+        self._respond(200, data, content_type=f'multipart/mixed; boundary={boundary}')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8089)
+    parser.add_argument('--rows', type=int, default=10000, help='synthetic data rows in the sheet')
+    parser.add_argument('--latency', default='none', help='latency distribution, e.g. uniform:20:80')
+    parser.add_argument('--error-429', type=float, default=0.0, help='fraction of sends answered with 429')
+    parser.add_argument('--error-5xx', type=float, default=0.0, help='fraction of sends answered with 500/502/503')
+    parser.add_argument('--quota-per-second', type=int, default=None, help='sends allowed per second')
+    parser.add_argument('--quota-total', type=int, default=None, help='sends allowed in total (then 403)')
+    args = parser.parse_args()
+
+    api = FakeGoogleApi(args.rows, LatencyModel(args.latency), args.error_429, args.error_5xx,
+                        SendQuota(args.quota_per_second, args.quota_total))
+    FakeGoogleApiHandler.api = api
+    server = ThreadingHTTPServer((args.host, args.port), FakeGoogleApiHandler)
+    server.daemon_threads = True
+    print(f"Fake Google API on http://{args.host}:{args.port} ({args.rows} rows)")
+    print(f"Point the mailer at it with: MAILER_API_BASE_URL=http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(json.dumps(api.summary(), indent=2, sort_keys=True))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -7,22 +7,46 @@ Reads recipients from Google Sheets
 
 import os
 import sys
+import asyncio
 import csv
 import time
 import base64
+import getpass
+import random
 import re
+import queue
+import smtplib
+import ssl
+import threading
+import json
+import hashlib
+import zipfile
+import gzip
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
+from functools import lru_cache
+from itertools import chain, islice, tee, zip_longest
+from operator import itemgetter
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.image import MIMEImage
-from typing import Dict, List, Optional, Tuple
+from email.mime.application import MIMEApplication
+from email.utils import getaddresses, make_msgid, parsedate_to_datetime
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 from io import BytesIO
+from urllib.parse import quote, urlparse
 
+import httplib2
+from google.auth.credentials import AnonymousCredentials
+from google.auth.exceptions import RefreshError
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.http import BatchHttpRequest, MediaIoBaseUpload
 
 try:
     from PIL import Image, ImageDraw, ImageFont
@@ -31,296 +55,47 @@ except ImportError:
     PIL_AVAILABLE = False
     print("⚠ Warning: Pillow not installed. Certificate generation disabled.")
 
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+try:
+    import aiohttp
+    AIOHTTP_AVAILABLE = True
+except ImportError:
+    AIOHTTP_AVAILABLE = False
+
+try:
+    import openpyxl
+    OPENPYXL_AVAILABLE = True
+except ImportError:
+    OPENPYXL_AVAILABLE = False
+
 # OAuth Scopes
 SCOPES = [
     'https://www.googleapis.com/auth/spreadsheets.readonly',
-    'https://www.googleapis.com/auth/gmail.send'
+    'https://www.googleapis.com/auth/gmail.send',
+    'https://www.googleapis.com/auth/drive.metadata.readonly'
 ]
 
-# ============================================================================
-# HTML EMAIL TEMPLATES
-# ============================================================================
-
-CERTIFICATE_HTML_TEMPLATE = """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Thank You for Attending</title>
-</head>
-<body style="margin: 0; padding: 0; background-color: #f5f5f5; font-family: Arial, Helvetica, sans-serif;">
-    <table role="presentation" cellspacing="0" cellpadding="0" border="0" width="100%" style="background-color: #f5f5f5;">
-        <tr>
-            <td style="padding: 40px 20px;">
-                <table role="presentation" cellspacing="0" cellpadding="0" border="0" width="640" style="margin: 0 auto; background-color: #ffffff; border-radius: 8px; box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
-                    <!-- Header -->
-                    <tr>
-                        <td style="padding: 40px 40px 30px; text-align: center; border-bottom: 3px solid #2c5282;">
-                            <h1 style="margin: 0; font-size: 26px; color: #1a202c; font-weight: bold;">{OrgName}</h1>
-                            <p style="margin: 8px 0 0; font-size: 14px; color: #718096;">Thank You for Attending</p>
-                        </td>
-                    </tr>
-
-                    <!-- Body -->
-                    <tr>
-                        <td style="padding: 40px;">
-                            <p style="margin: 0 0 20px; font-size: 16px; color: #2d3748; line-height: 1.6;">Dear {Name},</p>
-
-                            <p style="margin: 0 0 20px; font-size: 16px; color: #2d3748; line-height: 1.6;">
-                                {ThankYouMessage}
-                            </p>
-
-                            <p style="margin: 0 0 30px; font-size: 16px; color: #2d3748; line-height: 1.6;">
-                                {AttachmentLine}
-                            </p>
-
-                            {EventDetailsSection}
-
-                            {ResourcesSection}
-
-                            {FeedbackSection}
-
-                            <p style="margin: 0 0 8px; font-size: 16px; color: #2d3748; line-height: 1.6;">
-                                If you have any questions or would like to stay in touch, please contact us at
-                                <a href="mailto:{SupportEmail}" style="color: #2c5282; text-decoration: none;">{SupportEmail}</a>.
-                            </p>
-
-                            <p style="margin: 30px 0 8px; font-size: 16px; color: #2d3748; line-height: 1.6;">Warm regards,</p>
-                            <p style="margin: 0; font-size: 16px; color: #2d3748; line-height: 1.6;">
-                                <strong>{TeamOrSignerName}</strong><br>
-                                {Title}<br>
-                                {OrgName}
-                            </p>
-                        </td>
-                    </tr>
-
-                    <!-- Footer -->
-                    <tr>
-                        <td style="padding: 30px 40px; background-color: #f7fafc; border-top: 1px solid #e2e8f0; border-radius: 0 0 8px 8px;">
-                            <p style="margin: 0 0 12px; font-size: 13px; color: #718096; line-height: 1.6; text-align: center;">
-                                {FooterContact}
-                            </p>
-                            <p style="margin: 0 0 12px; font-size: 12px; color: #a0aec0; line-height: 1.5; text-align: center;">
-                                This message and certificate are intended for {Name}. Please do not share without consent.
-                            </p>
-                            <p style="margin: 0; font-size: 12px; color: #a0aec0; text-align: center;">
-                                &copy; {Year} {OrgName}. All rights reserved.
-                            </p>
-                        </td>
-                    </tr>
-                </table>
-            </td>
-        </tr>
-    </table>
-</body>
-</html>
-"""
-
-EVENT_HTML_TEMPLATE = """
-<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Event Invitation</title>
-</head>
-<body style="margin: 0; padding: 0; background-color: #f5f5f5; font-family: Arial, Helvetica, sans-serif;">
-    <table role="presentation" cellspacing="0" cellpadding="0" border="0" width="100%" style="background-color: #f5f5f5;">
-        <tr>
-            <td style="padding: 40px 20px;">
-                <table role="presentation" cellspacing="0" cellpadding="0" border="0" width="640" style="margin: 0 auto; background-color: #ffffff; border-radius: 8px; box-shadow: 0 2px 8px rgba(0,0,0,0.1);">
-                    <!-- Hero Image (Optional) -->
-                    {HeroImageSection}
-                    
-                    <!-- Header -->
-                    <tr>
-                        <td style="padding: 40px 40px 30px; text-align: center; border-bottom: 3px solid #2c5282;">
-                            <h1 style="margin: 0; font-size: 26px; color: #1a202c; font-weight: bold;">{OrgName}</h1>
-                            <p style="margin: 8px 0 0; font-size: 14px; color: #718096;">cordially invites you</p>
-                        </td>
-                    </tr>
-                    
-                    <!-- Body -->
-                    <tr>
-                        <td style="padding: 40px;">
-                            <p style="margin: 0 0 20px; font-size: 16px; color: #2d3748; line-height: 1.6;">Dear {Name},</p>
-                            
-                            <p style="margin: 0 0 30px; font-size: 16px; color: #2d3748; line-height: 1.6;">
-                                We are pleased to invite you to attend <strong>{EventTitle}</strong>, hosted by <strong>{OrgName}</strong>.
-                            </p>
-                            
-                            <!-- Event Details Box -->
-                            <table role="presentation" cellspacing="0" cellpadding="0" border="0" width="100%" style="background-color: #f7fafc; border-left: 4px solid #2c5282; border-radius: 6px; margin-bottom: 30px;">
-                                <tr>
-                                    <td style="padding: 24px;">
-                                        <h2 style="margin: 0 0 20px; font-size: 22px; color: #1a202c;">{EventTitle}</h2>
-                                        
-                                        <table role="presentation" cellspacing="0" cellpadding="0" border="0" width="100%">
-                                            <tr>
-                                                <td style="padding: 8px 0;">
-                                                    <p style="margin: 0; font-size: 15px; color: #2d3748; line-height: 1.6;">
-                                                        <strong>Date:</strong> {EventDate}
-                                                    </p>
-                                                </td>
-                                            </tr>
-                                            <tr>
-                                                <td style="padding: 8px 0;">
-                                                    <p style="margin: 0; font-size: 15px; color: #2d3748; line-height: 1.6;">
-                                                        <strong>Time:</strong> {EventTime} {EventTimezone}
-                                                    </p>
-                                                </td>
-                                            </tr>
-                                            <tr>
-                                                <td style="padding: 8px 0;">
-                                                    <p style="margin: 0; font-size: 15px; color: #2d3748; line-height: 1.6;">
-                                                        <strong>Location:</strong> {EventLocation}
-                                                    </p>
-                                                </td>
-                                            </tr>
-                                        </table>
-                                    </td>
-                                </tr>
-                            </table>
-                            
-                            <!-- Event Description -->
-                            <p style="margin: 0 0 20px; font-size: 16px; color: #2d3748; line-height: 1.6;">
-                                {EventDescription}
-                            </p>
-                            
-                            {OutcomesSection}
-                            
-                            {SpeakersSection}
-                            
-                            <!-- Action Buttons -->
-                            <table role="presentation" cellspacing="0" cellpadding="0" border="0" width="100%" style="margin-top: 30px;">
-                                <tr>
-                                    <td align="center" style="padding: 0 0 20px;">
-                                        <a href="{RSVP_URL}" 
-                                           style="display: inline-block; padding: 16px 48px; background-color: #2c5282; color: #ffffff; text-decoration: none; font-size: 16px; font-weight: bold; border-radius: 6px; margin: 0 8px;">
-                                            RSVP Now
-                                        </a>
-                                        <a href="{CalendarICSURL}" 
-                                           style="display: inline-block; padding: 16px 32px; background-color: #ffffff; color: #2c5282; text-decoration: none; font-size: 16px; font-weight: bold; border-radius: 6px; border: 2px solid #2c5282; margin: 0 8px;">
-                                            Add to Calendar
-                                        </a>
-                                    </td>
-                                </tr>
-                                <tr>
-                                    <td align="center" style="padding: 0 0 30px;">
-                                        <p style="margin: 0; font-size: 13px; color: #718096; line-height: 1.6;">
-                                            RSVP: <a href="{RSVP_URL}" style="color: #2c5282; word-break: break-all;">{RSVP_URL}</a><br>
-                                            Calendar: <a href="{CalendarICSURL}" style="color: #2c5282; word-break: break-all;">{CalendarICSURL}</a>
-                                        </p>
-                                    </td>
-                                </tr>
-                            </table>
-                            
-                            <p style="margin: 0 0 8px; font-size: 16px; color: #2d3748; line-height: 1.6;">
-                                We look forward to your participation. Should you have any questions, please contact us at 
-                                <a href="mailto:{SupportEmail}" style="color: #2c5282; text-decoration: none;">{SupportEmail}</a>.
-                            </p>
-                            
-                            <p style="margin: 30px 0 8px; font-size: 16px; color: #2d3748; line-height: 1.6;">Kind regards,</p>
-                            <p style="margin: 0; font-size: 16px; color: #2d3748; line-height: 1.6;">
-                                <strong>{OrgName} Team</strong>
-                            </p>
-                        </td>
-                    </tr>
-                    
-                    <!-- Footer -->
-                    <tr>
-                        <td style="padding: 30px 40px; background-color: #f7fafc; border-top: 1px solid #e2e8f0; border-radius: 0 0 8px 8px;">
-                            <p style="margin: 0 0 12px; font-size: 13px; color: #718096; line-height: 1.6; text-align: center;">
-                                {FooterContact}
-                            </p>
-                            {UnsubscribeSection}
-                            <p style="margin: 0; font-size: 12px; color: #a0aec0; text-align: center;">
-                                &copy; {Year} {OrgName}. All rights reserved.
-                            </p>
-                        </td>
-                    </tr>
-                </table>
-            </td>
-        </tr>
-    </table>
-</body>
-</html>
-"""
-
-# ============================================================================
-# PLAIN TEXT TEMPLATES
-# ============================================================================
-
-CERTIFICATE_TEXT_TEMPLATE = """
-{OrgName}
-Thank You for Attending
-
-Dear {Name},
-
-{ThankYouMessagePlain}
-
-{AttachmentLinePlain}
-
-{EventDetailsBlock}{ResourcesBlock}{FeedbackBlock}
-Warm regards,
-{TeamOrSignerName}
-{Title}
-{OrgName}
-
----
-{FooterContactText}
-© {Year} {OrgName}. All rights reserved.
-"""
-
-EVENT_TEXT_TEMPLATE = """
-{OrgName}
-Event Invitation
-
-Dear {Name},
-
-We are pleased to invite you to attend {EventTitle}, hosted by {OrgName}.
-
-EVENT DETAILS
-Event: {EventTitle}
-Date: {EventDate}
-Time: {EventTime} {EventTimezone}
-Location: {EventLocation}
-
-DESCRIPTION
-{EventDescription}
-
-{OutcomesText}
-
-{SpeakersText}
-
-RSVP
-Please confirm your attendance: {RSVP_URL}
-
-ADD TO CALENDAR
-{CalendarICSURL}
-
-We look forward to your participation. Should you have any questions, please contact us at {SupportEmail}.
-
-Kind regards,
-{OrgName} Team
-
----
-{FooterContactText}
-{UnsubscribeText}
-
-© {Year} {OrgName}. All rights reserved.
-"""
+# Send Gmail and Sheets requests to this base URL instead of Google
+# (e.g. a local fake_google_api.py server). OAuth is skipped when set.
+API_BASE_URL = os.environ.get('MAILER_API_BASE_URL')
 
 # ============================================================================
 # TEMPLATE CONFIGURATIONS
 # ============================================================================
 
+# Template files are resolved relative to this directory unless absolute
+TEMPLATE_DIR = os.path.dirname(os.path.abspath(__file__))
+
 TEMPLATE_CONFIGS = {
     'certificate': {
         'name': 'Thank You for Attending',
-        'html_template': CERTIFICATE_HTML_TEMPLATE,
-        'text_template': CERTIFICATE_TEXT_TEMPLATE,
+        'html_template_path': 'certificate_template.html',
+        'text_template_path': 'certificate_template.txt',
         'subject_default': 'Thank You for Attending',
         'required_fields': ['Name', 'Email'],
         'optional_fields': ['EventName', 'CourseTitle', 'EventDate', 'CompletionDate',
@@ -330,8 +105,8 @@ TEMPLATE_CONFIGS = {
     },
     'event': {
         'name': 'Upcoming Event Invitation',
-        'html_template': EVENT_HTML_TEMPLATE,
-        'text_template': EVENT_TEXT_TEMPLATE,
+        'html_template_path': 'event_announcment.html',
+        'text_template_path': 'event_announcment.txt',
         'subject_default': 'Invitation: {EventTitle} — {EventDate}',
         'required_fields': ['Name', 'Email', 'OrgName', 'EventTitle', 'EventDate', 
                            'EventTime', 'EventTimezone', 'EventLocation', 
@@ -343,18 +118,108 @@ TEMPLATE_CONFIGS = {
     }
 }
 
+# ============================================================================
+# TEMPLATE ENGINE
+# ============================================================================
+
+PLACEHOLDER_PATTERN = re.compile(r'\{(\w+)\}')
+
+
+class CompiledTemplate:
+    """
+    A template pre-split into literal text and {Placeholder} segments.
+    Rendering fills every placeholder in a single join. Placeholders with
+    no value are left as-is, and inserted values are not scanned again.
+    """
+
+    __slots__ = ('source', 'segments', 'placeholders')
+
+    def __init__(self, source: str, segments: Optional[List[str]] = None):
+        self.source = source
+        # re.split with one group alternates: literal, name, literal, ..., literal
+        self.segments = segments if segments is not None else PLACEHOLDER_PATTERN.split(source)
+        self.placeholders = tuple(self.segments[1::2])
+
+    def render(self, values: Dict[str, str]) -> str:
+        parts = self.segments[:]
+        for i in range(1, len(parts), 2):
+            name = parts[i]
+            if name in values:
+                parts[i] = str(values[name])
+            else:
+                parts[i] = f'{{{name}}}'
+        return ''.join(parts)
+
+    def bind(self, values: Dict[str, str], keep: Iterable[str]) -> 'CompiledTemplate':
+        """
+        Pre-render every placeholder except those in keep.
+        Returns a smaller template whose only placeholders are the kept ones.
+        """
+        keep = set(keep)
+        segments = []
+        literal = self.segments[0]
+        for i in range(1, len(self.segments), 2):
+            name = self.segments[i]
+            if name in keep:
+                segments.append(literal)
+                segments.append(name)
+                literal = self.segments[i + 1]
+            else:
+                value = str(values[name]) if name in values else f'{{{name}}}'
+                literal += value + self.segments[i + 1]
+        segments.append(literal)
+        return CompiledTemplate(self.source, segments)
+
+
+@lru_cache(maxsize=256)
+def compile_template(source: str) -> CompiledTemplate:
+    """Compile a template string once; later calls return the cached result."""
+    return CompiledTemplate(source)
+
+
+# Compiled template files: absolute path -> (mtime_ns, CompiledTemplate)
+_template_file_cache: Dict[str, Tuple[int, CompiledTemplate]] = {}
+
+
+def load_template(path: str) -> CompiledTemplate:
+    """
+    Load and compile a template file.
+    The compiled form is reused until the file's mtime changes, so edits
+    are picked up without re-parsing on every render.
+    """
+    if not os.path.isabs(path):
+        path = os.path.join(TEMPLATE_DIR, path)
+
+    mtime = os.stat(path).st_mtime_ns
+    cached = _template_file_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+
+    with open(path, 'r', encoding='utf-8') as f:
+        compiled = CompiledTemplate(f.read())
+    _template_file_cache[path] = (mtime, compiled)
+    return compiled
+
+
+def get_compiled_template(template_key: str, part: str) -> CompiledTemplate:
+    """Compiled template file for TEMPLATE_CONFIGS[template_key] (part is 'html' or 'text')."""
+    return load_template(TEMPLATE_CONFIGS[template_key][f'{part}_template_path'])
+
 # ============================================================================
 # AUTHENTICATION
 # ============================================================================
 
-def authorize() -> Tuple[any, any]:
+def load_credentials():
     """
-    Authorize with Google APIs using OAuth 2.0.
-    Returns authenticated service objects for Sheets and Gmail.
+    Load OAuth 2.0 credentials, logging in through the browser if needed.
     
     Authentication is cached in token.json - you only need to login once!
     The token will automatically refresh when expired.
     """
+    if API_BASE_URL:
+        print(f"✓ Using API server at {API_BASE_URL} - skipping Google login\n")
+        return AnonymousCredentials()
+    
     creds = None
     
     # Check for existing token
@@ -414,12 +279,191 @@ def authorize() -> Tuple[any, any]:
             print(f"\n⚠ Warning: Could not save token: {e}")
             print("  You may need to re-authenticate next time.\n")
     
+    return creds
+
+def authorize(creds=None) -> Tuple[any, any]:
+    """
+    Authorize with Google APIs using OAuth 2.0.
+    Returns authenticated service objects for Sheets and Gmail.
+    Credentials are loaded with load_credentials() unless given.
+    """
+    if creds is None:
+        creds = load_credentials()
+    
     # Build service objects
-    sheets_service = build('sheets', 'v4', credentials=creds)
-    gmail_service = build('gmail', 'v1', credentials=creds)
+    sheets_service = build_service('sheets', 'v4', creds)
+    gmail_service = build_service('gmail', 'v1', creds)
     
     return sheets_service, gmail_service
 
+# An api_endpoint override replaces rootUrl + servicePath, so APIs that keep
+# the version in servicePath (rather than in each method path) need it appended
+SERVICE_PATHS = {('drive', 'v3'): 'drive/v3/'}
+
+def build_service(api_name: str, version: str, creds):
+    """Build a Google API service object, pointed at API_BASE_URL if set."""
+    if API_BASE_URL:
+        service_path = SERVICE_PATHS.get((api_name, version), '')
+        return build(api_name, version, credentials=creds,
+                     client_options={'api_endpoint': API_BASE_URL.rstrip('/') + '/' + service_path})
+    return build(api_name, version, credentials=creds)
+
+# ============================================================================
+# ROW SOURCES
+# ============================================================================
+
+class RowSource:
+    """
+    A table of recipients: headers is the header row, and iterating yields
+    the data rows as lists of strings (rows may be shorter than headers).
+    Iterating again starts from the first data row. If columns is set, rows
+    hold only those header columns (sorted 0-based indexes), in order.
+    
+    Implemented by SheetRowStream for Google Sheets, SnapshotRowSource for
+    cached sheets and by the local file readers below, which all stream
+    rows so large tables use constant memory.
+    """
+
+    headers: List[str] = []
+    columns: Optional[List[int]] = None
+
+    def field_positions(self, field_mapping: Dict[str, int]) -> Dict[str, int]:
+        """Translate a field -> header column mapping into positions within rows."""
+        if self.columns is None:
+            return dict(field_mapping)
+        return {field: self.columns.index(col_idx) for field, col_idx in field_mapping.items()}
+
+    def __iter__(self) -> Iterator[List[str]]:
+        raise NotImplementedError
+
+class CsvRowSource(RowSource):
+    """
+    Rows of a CSV or TSV file, read one line at a time. The delimiter is
+    sniffed from the start of the file unless given.
+    """
+
+    def __init__(self, path: str, delimiter: Optional[str] = None, encoding: str = 'utf-8-sig'):
+        self.path = path
+        self.encoding = encoding
+        with open(path, newline='', encoding=encoding) as f:
+            if delimiter is None:
+                sample = f.read(64 * 1024)
+                try:
+                    delimiter = csv.Sniffer().sniff(sample, delimiters=',;\t').delimiter
+                except csv.Error:
+                    delimiter = ','
+                f.seek(0)
+            self.delimiter = delimiter
+            self.headers = next(csv.reader(f, delimiter=delimiter), [])
+        if not self.headers:
+            raise ValueError(f"{path} is empty")
+
+    def __iter__(self) -> Iterator[List[str]]:
+        with open(self.path, newline='', encoding=self.encoding) as f:
+            reader = csv.reader(f, delimiter=self.delimiter)
+            next(reader, None)
+            yield from reader
+
+def cell_text(value) -> str:
+    """A JSON or spreadsheet cell value as the string a sheet would show."""
+    if value is None:
+        return ''
+    if isinstance(value, str):
+        return value
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, datetime):
+        return value.isoformat(sep=' ') if value.time() != datetime.min.time() else value.date().isoformat()
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+class JsonlRowSource(RowSource):
+    """
+    Rows of a JSON Lines file with one object per line, read one line at a
+    time. The headers are the keys of the first object; keys first seen in
+    later objects are ignored and missing keys are empty.
+    """
+
+    def __init__(self, path: str, encoding: str = 'utf-8'):
+        self.path = path
+        self.encoding = encoding
+        first = next(self._objects(), None)
+        if first is None:
+            raise ValueError(f"{path} is empty")
+        self.headers = list(first)
+
+    def _objects(self) -> Iterator[Dict]:
+        with open(self.path, encoding=self.encoding) as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise ValueError(f"{self.path}:{line_number}: expected a JSON object")
+                yield record
+
+    def __iter__(self) -> Iterator[List[str]]:
+        for record in self._objects():
+            yield [cell_text(record.get(key)) for key in self.headers]
+
+class XlsxRowSource(RowSource):
+    """
+    Rows of one worksheet of an .xlsx workbook (the first if sheet_name is
+    None), read with openpyxl in read-only mode so rows are streamed from
+    the file. Cells hold their last calculated values.
+    """
+
+    def __init__(self, path: str, sheet_name: Optional[str] = None):
+        if not OPENPYXL_AVAILABLE:
+            raise ImportError("openpyxl is required to read .xlsx files. Install with: pip install openpyxl")
+        self.path = path
+        self.sheet_name = sheet_name
+        self.headers = next(self._rows(), [])
+        if not self.headers:
+            raise ValueError(f"{path} is empty")
+
+    def _rows(self) -> Iterator[List[str]]:
+        workbook = openpyxl.load_workbook(self.path, read_only=True, data_only=True)
+        try:
+            worksheet = workbook[self.sheet_name] if self.sheet_name else workbook.worksheets[0]
+            for values in worksheet.iter_rows(values_only=True):
+                row = [cell_text(value) for value in values]
+                # Read-only worksheets pad rows out to the sheet's width
+                while row and row[-1] == '':
+                    row.pop()
+                yield row
+        finally:
+            workbook.close()
+
+    def __iter__(self) -> Iterator[List[str]]:
+        rows = self._rows()
+        next(rows, None)
+        yield from rows
+
+# Local file types that can be used instead of a Google Sheet
+ROW_SOURCE_TYPES = {
+    '.csv': CsvRowSource,
+    '.tsv': lambda path: CsvRowSource(path, delimiter='\t'),
+    '.jsonl': JsonlRowSource,
+    '.ndjson': JsonlRowSource,
+    '.xlsx': XlsxRowSource,
+    '.xlsm': XlsxRowSource,
+}
+
+def is_row_source_path(value: str) -> bool:
+    """True if value names a local file type that open_row_source() reads."""
+    return os.path.splitext(value)[1].lower() in ROW_SOURCE_TYPES
+
+def open_row_source(path: str) -> RowSource:
+    """Open a local CSV, TSV, JSONL or XLSX file as a RowSource, chosen by extension."""
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in ROW_SOURCE_TYPES:
+        raise ValueError(f"Unsupported file type '{extension}' (use {', '.join(ROW_SOURCE_TYPES)})")
+    return ROW_SOURCE_TYPES[extension](path)
+
 # ============================================================================
 # GOOGLE SHEETS
 # ============================================================================
@@ -454,52 +498,454 @@ def extract_sheet_id(input_string: str) -> str:
     # If no pattern matched, return as-is and let it fail with better error
     return input_string
 
-def fetch_rows(sheets_service, sheet_id: str, range_name: str = None) -> Tuple[List[str], List[List[str]]]:
+# Rows per values.get request when reading a sheet
+SHEET_PAGE_SIZE = 5000
+# Pages fetched ahead of the consumer by the background reader
+SHEET_PREFETCH_PAGES = 2
+# Local snapshots of fetched sheet rows
+SHEET_CACHE_DIR = '.sheet_cache'
+
+def column_letter(number: int) -> str:
+    """1-based column number to A1 letters (1 -> A, 27 -> AA)."""
+    letters = ''
+    while number > 0:
+        number, remainder = divmod(number - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+def sheet_range(sheet_name: str, first_row: int, last_row: int, last_column: str,
+                first_column: str = 'A') -> str:
+    """A1 range for rows first_row..last_row of a sheet, e.g. 'Sheet1'!A2:Z5001."""
+    quoted_name = sheet_name.replace("'", "''")
+    return f"'{quoted_name}'!{first_column}{first_row}:{last_column}{last_row}"
+
+def column_runs(columns: List[int]) -> List[Tuple[int, int]]:
+    """Group sorted 0-based column indexes into (first, last) runs of adjacent columns."""
+    runs = []
+    for column in columns:
+        if runs and column == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], column)
+        else:
+            runs.append((column, column))
+    return runs
+
+class SheetRowStream(RowSource):
     """
-    Fetch rows from Google Sheet.
-    If range_name is None, fetches all data automatically.
-    Returns (headers, data_rows).
+    Data rows of one sheet, read in windows of page_size rows.
+    
+    The first page is fetched on creation. Iterating yields the data rows;
+    later pages are fetched by a background thread up to
+    SHEET_PREFETCH_PAGES ahead of the consumer, so sending can start while
+    the rest of the sheet downloads. Reading stops at the first empty
+    window. Errors from later pages are raised by the iterator.
+    
+    If columns (0-based indexes) is given, only those columns are
+    downloaded, with one values.batchGet per page, and each row holds just
+    those cells in column order. Use field_positions() to index them.
+    
+    If snapshot_writer is given, the first full read also writes each row
+    to it as it is yielded, and commits the snapshot at the end.
+    """
+
+    def __init__(self, sheets_service, sheet_id: str, sheet: Dict, page_size: int = SHEET_PAGE_SIZE,
+                 columns: Optional[Iterable[int]] = None,
+                 snapshot_writer: Optional['SnapshotWriter'] = None):
+        self.sheets_service = sheets_service
+        self.sheet_id = sheet_id
+        self.sheet_name = sheet['title']
+        self.headers = sheet['headers']
+        self.page_size = page_size
+        self.columns = sorted(set(columns)) if columns is not None else None
+        self.snapshot_writer = snapshot_writer
+        if self.columns is None:
+            self.last_column = column_letter(max(1, sheet['column_count']))
+        else:
+            self.column_runs = column_runs(self.columns)
+        
+        self.first_page = self._fetch(2, page_size + 1)
+
+    def _fetch(self, first_row: int, last_row: int) -> List[List[str]]:
+        if self.columns is not None:
+            return self._fetch_columns(first_row, last_row)
+        result = self.sheets_service.spreadsheets().values().get(
+            spreadsheetId=self.sheet_id,
+            range=sheet_range(self.sheet_name, first_row, last_row, self.last_column)
+        ).execute()
+        return result.get('values', [])
+
+    def _fetch_columns(self, first_row: int, last_row: int) -> List[List[str]]:
+        ranges = [sheet_range(self.sheet_name, first_row, last_row, column_letter(last + 1), column_letter(first + 1))
+                  for first, last in self.column_runs]
+        result = self.sheets_service.spreadsheets().values().batchGet(
+            spreadsheetId=self.sheet_id, ranges=ranges, majorDimension='COLUMNS',
+            fields='valueRanges.values'
+        ).execute()
+        
+        # Each range comes back as columns with trailing empty cells and columns trimmed
+        columns = []
+        for (first, last), value_range in zip(self.column_runs, result.get('valueRanges', [])):
+            run_columns = value_range.get('values', [])
+            columns.extend(run_columns + [[]] * (last - first + 1 - len(run_columns)))
+        if not any(columns):
+            return []
+        return [list(row) for row in zip_longest(*columns, fillvalue='')]
+
+    def _later_pages(self) -> Iterator[List[List[str]]]:
+        first_row = self.page_size + 2
+        while True:
+            values = self._fetch(first_row, first_row + self.page_size - 1)
+            if not values:
+                return
+            yield values
+            first_row += self.page_size
+
+    def _prefetch(self, pages: queue.Queue):
+        try:
+            for page in self._later_pages():
+                pages.put(page)
+        except Exception as e:
+            pages.put(e)
+        pages.put(None)
+
+    def __iter__(self) -> Iterator[List[str]]:
+        writer, self.snapshot_writer = self.snapshot_writer, None
+        if writer is None:
+            yield from self._download()
+            return
+        try:
+            for row in self._download():
+                writer.write(row)
+                yield row
+        except BaseException:
+            # Includes the consumer stopping early (GeneratorExit)
+            writer.discard()
+            raise
+        writer.commit()
+
+    def _download(self) -> Iterator[List[str]]:
+        yield from self.first_page
+        # The API trims trailing empty rows; restore them if more data follows
+        blank_rows = self.page_size - len(self.first_page)
+        
+        pages = queue.Queue(maxsize=SHEET_PREFETCH_PAGES)
+        threading.Thread(target=self._prefetch, args=(pages,), name='sheet-reader', daemon=True).start()
+        while True:
+            page = pages.get()
+            if page is None:
+                return
+            if isinstance(page, Exception):
+                raise page
+            for _ in range(blank_rows):
+                yield []
+            yield from page
+            blank_rows = self.page_size - len(page)
+
+SNAPSHOT_FORMAT_VERSION = 2
+
+class SnapshotWriter:
+    """
+    Writes one sheet snapshot row by row into a temporary file, which
+    commit() moves into place. Write errors are reported once and the
+    snapshot is dropped; they never interrupt the caller.
+    """
+
+    def __init__(self, path: str, metadata: Dict):
+        self.path = path
+        self.tmp_path = f"{path}.{os.getpid()}.tmp"
+        self.metadata = metadata
+        self.file = None
+        self.failed = False
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self.file = gzip.open(self.tmp_path, 'wt', encoding='utf-8', compresslevel=6)
+        self.file.write(json.dumps(self.metadata, separators=(',', ':')) + '\n')
+
+    def _fail(self, error: OSError):
+        print(f"⚠ Warning: Could not save sheet cache: {error}")
+        self.failed = True
+        self.discard()
+
+    def write(self, row: List[str]):
+        if self.failed:
+            return
+        try:
+            if self.file is None:
+                self._open()
+            self.file.write(json.dumps(row, separators=(',', ':')) + '\n')
+        except OSError as e:
+            self._fail(e)
+
+    def commit(self):
+        """Finish the snapshot and replace any previous one."""
+        if self.failed:
+            return
+        try:
+            if self.file is None:
+                self._open()
+            self.file.close()
+            self.file = None
+            os.replace(self.tmp_path, self.path)
+        except OSError as e:
+            self._fail(e)
+
+    def discard(self):
+        """Drop a partly written snapshot, keeping the previous one."""
+        if self.file is not None:
+            try:
+                self.file.close()
+            except OSError:
+                pass
+            self.file = None
+        try:
+            os.remove(self.tmp_path)
+        except OSError:
+            pass
+
+class SheetSnapshotCache:
+    """
+    Gzipped JSON Lines snapshots of fetched sheet rows, one file per
+    spreadsheet and sheet. The first line records the spreadsheet's Drive
+    modifiedTime when it was downloaded, the header row, and which columns
+    the rows hold, so callers can tell whether it is still current; each
+    following line is one row.
+    """
+
+    def __init__(self, directory: str = SHEET_CACHE_DIR):
+        self.directory = directory
+
+    def _path(self, sheet_id: str, sheet_name: str) -> str:
+        key = hashlib.sha256(f"{sheet_id}\0{sheet_name}".encode('utf-8')).hexdigest()[:32]
+        return os.path.join(self.directory, f"{key}.jsonl.gz")
+
+    def load(self, sheet_id: str, sheet_name: str) -> Optional[Dict]:
+        """
+        Return the stored snapshot's metadata (rows are read later through
+        SnapshotRowSource), or None if there is none or it is unreadable.
+        """
+        path = self._path(sheet_id, sheet_name)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                snapshot = json.loads(f.readline())
+        except (OSError, ValueError):
+            return None
+        if (not isinstance(snapshot, dict)
+                or snapshot.get('version') != SNAPSHOT_FORMAT_VERSION
+                or snapshot.get('sheet_id') != sheet_id
+                or snapshot.get('sheet_name') != sheet_name):
+            return None
+        snapshot['path'] = path
+        return snapshot
+
+    def writer(self, sheet_id: str, sheet_name: str, modified_time: str, headers: List[str],
+               columns: Optional[List[int]]) -> SnapshotWriter:
+        """Start a new snapshot for a sheet; the old one stays until it is committed."""
+        return SnapshotWriter(self._path(sheet_id, sheet_name), {
+            'version': SNAPSHOT_FORMAT_VERSION,
+            'sheet_id': sheet_id,
+            'sheet_name': sheet_name,
+            'modified_time': modified_time,
+            'saved_at': time.time(),
+            'headers': headers,
+            'columns': columns,
+        })
+
+class SnapshotRowSource(RowSource):
+    """Rows of a sheet snapshot loaded by SheetSnapshotCache, read from disk as iterated."""
+
+    def __init__(self, snapshot: Dict):
+        self.path = snapshot['path']
+        self.headers = snapshot['headers']
+        self.columns = snapshot['columns']
+
+    def __iter__(self) -> Iterator[List[str]]:
+        with gzip.open(self.path, 'rt', encoding='utf-8') as f:
+            f.readline()
+            for line in f:
+                yield json.loads(line)
+
+def snapshot_covers(snapshot: Dict, columns: Iterable[int]) -> bool:
+    """True if a snapshot holds every one of the given columns."""
+    return snapshot['columns'] is None or set(columns) <= set(snapshot['columns'])
+
+def format_age(seconds: float) -> str:
+    """Rough age of something, like '45s', '12 min' or '3.5 h'."""
+    if seconds < 60:
+        return f"{seconds:.0f}s"
+    if seconds < 3600:
+        return f"{seconds / 60:.0f} min"
+    if seconds < 48 * 3600:
+        return f"{seconds / 3600:.1f} h"
+    return f"{seconds / 86400:.0f} days"
+
+def sheet_modified_time(drive_service, sheet_id: str) -> Optional[str]:
+    """
+    Last-modified time of a spreadsheet from the Drive API, or None
+    if it cannot be read (e.g. a token issued before the Drive scope was added).
     """
     try:
-        if range_name is None:
-            # Get sheet metadata to find the first sheet name
-            sheet_metadata = sheets_service.spreadsheets().get(spreadsheetId=sheet_id).execute()
-            sheets = sheet_metadata.get('sheets', [])
-            
-            if not sheets:
-                print("ERROR: No sheets found in the spreadsheet.")
+        result = drive_service.files().get(fileId=sheet_id, fields='modifiedTime',
+                                           supportsAllDrives=True).execute()
+        return result.get('modifiedTime')
+    except HttpError as error:
+        print(f"⚠ Could not read the sheet's last-modified time ({error.resp.status}); "
+              f"the local sheet cache is not used.")
+        if error.resp.status == 403:
+            print("  Delete token.json and log in again to grant Drive metadata access.")
+        return None
+    except (OSError, httplib2.HttpLib2Error, RefreshError) as error:
+        print(f"⚠ Could not read the sheet's last-modified time ({error}); "
+              f"the local sheet cache is not used.")
+        return None
+
+def exit_on_sheet_error(error: HttpError):
+    """Explain a failed Sheets request and exit."""
+    print(f"ERROR fetching sheet data: {error}")
+    if '404' in str(error):
+        print("\nTroubleshooting:")
+        print("1. Check that the Sheet ID is correct")
+        print("2. Ensure the sheet is shared with your Google account")
+        print("3. Verify you have at least 'Viewer' access to the sheet")
+    sys.exit(1)
+
+def open_sheet(sheets_service, sheet_id: str, sheet_name: Optional[str] = None) -> Dict:
+    """
+    Look up a sheet and read its header row.
+    If sheet_name is None, uses the first sheet.
+    Returns a dict with 'title', 'column_count' and 'headers'.
+    """
+    try:
+        # Sheet metadata gives the sheet title and how many columns to request
+        sheet_metadata = sheets_service.spreadsheets().get(
+            spreadsheetId=sheet_id, fields='sheets.properties').execute()
+        sheets = sheet_metadata.get('sheets', [])
+        
+        if not sheets:
+            print("ERROR: No sheets found in the spreadsheet.")
+            sys.exit(1)
+        
+        properties = sheets[0]['properties']
+        if sheet_name is not None:
+            matching = [s['properties'] for s in sheets if s['properties']['title'] == sheet_name]
+            if not matching:
+                print(f"ERROR: Sheet '{sheet_name}' not found in the spreadsheet.")
                 sys.exit(1)
-            
-            # Get the first sheet's title
-            first_sheet_name = sheets[0]['properties']['title']
-            print(f"📋 Using sheet: '{first_sheet_name}'")
-            
-            # Fetch all data from the first sheet
-            range_name = first_sheet_name
+            properties = matching[0]
+        else:
+            print(f"📋 Using sheet: '{properties['title']}'")
         
+        quoted_name = properties['title'].replace("'", "''")
         result = sheets_service.spreadsheets().values().get(
-            spreadsheetId=sheet_id,
-            range=range_name
-        ).execute()
-        
+            spreadsheetId=sheet_id, range=f"'{quoted_name}'!1:1").execute()
         values = result.get('values', [])
         if not values:
             print("ERROR: No data found in sheet.")
             sys.exit(1)
         
-        headers = values[0]
-        data_rows = values[1:] if len(values) > 1 else []
-        
-        return headers, data_rows
+        return {
+            'title': properties['title'],
+            'column_count': properties.get('gridProperties', {}).get('columnCount', len(values[0])),
+            'headers': values[0],
+        }
     
     except HttpError as error:
-        print(f"ERROR fetching sheet data: {error}")
-        if '404' in str(error):
-            print("\nTroubleshooting:")
-            print("1. Check that the Sheet ID is correct")
-            print("2. Ensure the sheet is shared with your Google account")
-            print("3. Verify you have at least 'Viewer' access to the sheet")
-        sys.exit(1)
+        exit_on_sheet_error(error)
+
+def stream_rows(sheets_service, sheet_id: str, sheet: Optional[Dict] = None,
+                page_size: int = SHEET_PAGE_SIZE, columns: Optional[Iterable[int]] = None,
+                snapshot_writer: Optional[SnapshotWriter] = None) -> SheetRowStream:
+    """
+    Open a paged reader on a Google Sheet, as returned by open_sheet()
+    (the first sheet if not given). columns limits the download to those
+    0-based column indexes; snapshot_writer receives the rows as they are read.
+    """
+    if sheet is None:
+        sheet = open_sheet(sheets_service, sheet_id)
+    try:
+        return SheetRowStream(sheets_service, sheet_id, sheet, page_size, columns, snapshot_writer)
+    except HttpError as error:
+        exit_on_sheet_error(error)
+
+def fetch_rows(sheets_service, sheet_id: str, sheet_name: Optional[str] = None) -> Tuple[List[str], List[List[str]]]:
+    """
+    Fetch every row of a Google Sheet (the first sheet if sheet_name is None).
+    Returns (headers, data_rows).
+    """
+    stream = stream_rows(sheets_service, sheet_id, open_sheet(sheets_service, sheet_id, sheet_name))
+    return stream.headers, list(stream)
+
+class RowLayout:
+    """
+    Field index shared by every RowRecord of a run, built once from the
+    resolved column mapping (field -> position in source rows).
+    If FirstName and LastName are mapped but Name is not, Name is
+    derived from them whenever it is read. constants are fields with the
+    same value in every row (e.g. the run's certificate format).
+    """
+
+    def __init__(self, field_mapping: Dict[str, int], constants: Optional[Dict[str, str]] = None):
+        self.fields = list(field_mapping)
+        self.positions = [field_mapping[field] for field in self.fields]
+        self.index: Dict[str, Optional[int]] = {field: i for i, field in enumerate(self.fields)}
+        # Rows that reach the last mapped column take all cells in one C-level call
+        self.width = max(self.positions, default=-1) + 1
+        self.getter = itemgetter(*self.positions) if len(self.positions) > 1 else None
+        self.first_last = None
+        if 'FirstName' in self.index and 'LastName' in self.index and 'Name' not in self.index:
+            self.first_last = (self.index['FirstName'], self.index['LastName'])
+            self.index['Name'] = None
+            self.fields.append('Name')
+        # Constants are indexed from the end: ~0, ~1, ...
+        self.constants = []
+        for field, value in (constants or {}).items():
+            if field not in self.index:
+                self.index[field] = ~len(self.constants)
+                self.constants.append(value)
+                self.fields.append(field)
+
+    def record(self, row: List[str]) -> 'RowRecord':
+        """Turn a source row into a RowRecord, stripping each mapped cell."""
+        width = len(row)
+        if self.getter is not None and width >= self.width:
+            return RowRecord(self, tuple(map(str.strip, self.getter(row))))
+        return RowRecord(self, tuple([row[position].strip() if position < width else ''
+                                      for position in self.positions]))
+
+class RowRecord(Mapping):
+    """
+    Read-only mapping view of one row: a tuple of cell values looked up
+    through the shared RowLayout, instead of a dict per row.
+    """
+
+    __slots__ = ('_layout', '_values')
+
+    def __init__(self, layout: RowLayout, values: Tuple[str, ...]):
+        self._layout = layout
+        self._values = values
+
+    def __getitem__(self, field: str) -> str:
+        position = self._layout.index[field]
+        if position is None:
+            first, last = self._layout.first_last
+            return f"{self._values[first]} {self._values[last]}".strip()
+        if position < 0:
+            return self._layout.constants[~position]
+        return self._values[position]
+
+    def __contains__(self, field) -> bool:
+        return field in self._layout.index
+
+    def get(self, field: str, default=None):
+        return self[field] if field in self._layout.index else default
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._layout.fields)
+
+    def __len__(self) -> int:
+        return len(self._layout.fields)
+
+    def __repr__(self) -> str:
+        return f"RowRecord({dict(self)!r})"
 
 # ============================================================================
 # VALIDATION
@@ -550,6 +996,27 @@ def validate_row(row_dict: Dict[str, str], template_key: str) -> Tuple[bool, Opt
 # CERTIFICATE GENERATION
 # ============================================================================
 
+def _dark_row_counts_python(gray, dark_threshold: int, start_y: int, end_y: int) -> List[int]:
+    """Count dark pixels per row with per-pixel access (slow fallback)."""
+    width = gray.size[0]
+    pixels = gray.load()
+    return [sum(1 for x in range(width) if pixels[x, y] <= dark_threshold)
+            for y in range(start_y, end_y)]
+
+
+def _dark_row_counts_bulk(gray, dark_threshold: int, start_y: int, end_y: int) -> List[int]:
+    """Count dark pixels per row in bulk (NumPy when installed, else byte counting)."""
+    width = gray.size[0]
+
+    if NUMPY_AVAILABLE:
+        band = np.asarray(gray)[start_y:end_y]
+        return (band <= dark_threshold).sum(axis=1).tolist()
+
+    # Threshold once: dark pixels become 1, everything else 0
+    mask = gray.point(lambda p: 1 if p <= dark_threshold else 0).tobytes()
+    return [mask.count(1, y * width, (y + 1) * width) for y in range(start_y, end_y)]
+
+
 def detect_horizontal_guideline(template_path: str, dark_threshold: int = 60, 
                                 min_fraction: float = 0.4, search_margin: float = 0.15) -> Tuple[Optional[int], float]:
     """Detect a predominantly dark horizontal line near the middle of the template."""
@@ -557,16 +1024,19 @@ def detect_horizontal_guideline(template_path: str, dark_threshold: int = 60,
         with Image.open(template_path) as img:
             gray = img.convert('L')
             width, height = gray.size
-            pixels = gray.load()
 
             start_y = int(height * search_margin)
             end_y = int(height * (1 - search_margin))
 
+            try:
+                row_counts = _dark_row_counts_bulk(gray, dark_threshold, start_y, end_y)
+            except Exception:
+                row_counts = _dark_row_counts_python(gray, dark_threshold, start_y, end_y)
+
             best_y = None
             best_fraction = 0.0
 
-            for y in range(start_y, end_y):
-                dark_pixels = sum(1 for x in range(width) if pixels[x, y] <= dark_threshold)
+            for y, dark_pixels in enumerate(row_counts, start_y):
                 fraction = dark_pixels / width
 
                 if fraction > best_fraction:
@@ -581,165 +1051,663 @@ def detect_horizontal_guideline(template_path: str, dark_threshold: int = 60,
         return None, 0.0
 
 
+CERTIFICATE_FONT_PATHS = [
+    "/usr/share/fonts/truetype/msttcorefonts/ScriptMTBold.ttf",
+    "/usr/share/fonts/truetype/scriptmt/ScriptMTBold.ttf",
+    "/usr/share/fonts/truetype/scriptmt/script.ttf",
+    "/usr/share/fonts/truetype/msttcorefonts/SCRIPTBL.TTF",
+    "/Library/Fonts/ScriptMTBold.ttf",
+    "/System/Library/Fonts/Supplemental/ScriptMTBold.ttf",
+    "C:\\Windows\\Fonts\\SCRIPTBL.TTF",
+    "C:\\Windows\\Fonts\\ScriptMTBold.ttf",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "/System/Library/Fonts/Helvetica.ttc",
+    "C:\\Windows\\Fonts\\Arial.ttf",
+    "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf"
+]
+
+
+def load_certificate_font(font_size: int):
+    """Load the first available certificate font, falling back to Pillow's default."""
+    try:
+        for font_path in CERTIFICATE_FONT_PATHS:
+            if os.path.exists(font_path):
+                return ImageFont.truetype(font_path, font_size)
+        return ImageFont.load_default()
+    except Exception:
+        return ImageFont.load_default()
+
+
+def parse_hex_color(font_color: str) -> Tuple[int, int, int]:
+    """Convert a '#RRGGBB' string to an RGB tuple (black if not hex)."""
+    if font_color.startswith('#'):
+        font_color = font_color.lstrip('#')
+        return tuple(int(font_color[i:i+2], 16) for i in (0, 2, 4))
+    return (0, 0, 0)  # Default black
+
+
+TEMPLATE_ANALYSIS_SUFFIX = '.analysis.json'
+
+
+def template_content_hash(template_path: str) -> str:
+    """SHA-256 of the template file contents."""
+    with open(template_path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def load_template_analysis(template_path: str, content_hash: str) -> Optional[Dict]:
+    """Return the saved analysis of a template, or None if missing or for other contents."""
+    try:
+        with open(template_path + TEMPLATE_ANALYSIS_SUFFIX, 'r', encoding='utf-8') as f:
+            analysis = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(analysis, dict) or analysis.get('template_hash') != content_hash:
+        return None
+    return analysis
+
+
+def save_template_analysis(template_path: str, analysis: Dict):
+    """Write a template analysis to its sidecar JSON next to the template."""
+    try:
+        with open(template_path + TEMPLATE_ANALYSIS_SUFFIX, 'w', encoding='utf-8') as f:
+            json.dump(analysis, f, indent=2)
+    except OSError:
+        pass  # Read-only template location: analysis just isn't persisted
+
+
+def analyze_template(template_path: str, content_hash: Optional[str] = None) -> Dict:
+    """
+    Return the guideline detection and image size for a template.
+    Results are saved in a sidecar JSON next to the template, keyed by the
+    template's content hash, so an unchanged template is never scanned twice.
+    An unreadable template gives no guideline and image_size None.
+    """
+    if content_hash is None:
+        content_hash = template_content_hash(template_path)
+
+    analysis = load_template_analysis(template_path, content_hash)
+    if analysis is None:
+        detected_line_y, coverage = detect_horizontal_guideline(template_path)
+        try:
+            with Image.open(template_path) as img:
+                image_size = list(img.size)
+        except Exception:
+            image_size = None
+        analysis = {
+            'template_hash': content_hash,
+            'detected_line_y': detected_line_y,
+            'coverage': coverage,
+            'image_size': image_size,
+            'fonts': {}
+        }
+        save_template_analysis(template_path, analysis)
+    return analysis
+
+
+def record_font_metrics(template_path: str, analysis: Dict, font_size: int):
+    """Add the certificate font's metrics at font_size to a saved template analysis."""
+    fonts = analysis.setdefault('fonts', {})
+    if str(font_size) in fonts:
+        return
+    font = load_certificate_font(font_size)
+    try:
+        ascent, descent = font.getmetrics()
+    except Exception:
+        ascent, descent = None, None
+    fonts[str(font_size)] = {
+        'path': getattr(font, 'path', None),
+        'ascent': ascent,
+        'descent': descent
+    }
+    save_template_analysis(template_path, analysis)
+
+
+# Certificate output encodings: Pillow format, file extension and MIME type
+CERTIFICATE_OUTPUT_FORMATS = {
+    'png': {'label': 'PNG', 'pil_format': 'PNG', 'extension': 'png', 'mime_type': 'image/png',
+            'description': 'a PNG image'},
+    'png-palette': {'label': 'PNG, palette-quantized (smaller)', 'pil_format': 'PNG',
+                    'extension': 'png', 'mime_type': 'image/png', 'description': 'a PNG image'},
+    'jpeg': {'label': 'JPEG', 'pil_format': 'JPEG', 'extension': 'jpg', 'mime_type': 'image/jpeg',
+             'description': 'a JPEG image'},
+    'webp': {'label': 'WebP', 'pil_format': 'WEBP', 'extension': 'webp', 'mime_type': 'image/webp',
+             'description': 'a WebP image'},
+    'pdf': {'label': 'PDF (single page)', 'pil_format': 'PDF', 'extension': 'pdf',
+            'mime_type': 'application/pdf', 'description': 'a PDF document'},
+}
+
+
+CERTIFICATE_CACHE_DIR = '.certificate_cache'
+
+
+class CertificateCache:
+    """
+    Content-addressed disk cache of rendered certificates.
+    Entries are files named by key; file mtime tracks last use, and the
+    least recently used entries are evicted once max_bytes is exceeded.
+    """
+
+    def __init__(self, directory: str = CERTIFICATE_CACHE_DIR, max_bytes: int = 500 * 1024 * 1024):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+        self._total_bytes = sum(size for _, size, _ in self._entries())
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        """List (mtime, size, path) for every cache entry."""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.is_file() and not entry.name.endswith('.tmp'):
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        return entries
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return cached bytes for key, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)  # mark as recently used
+        except OSError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def put(self, key: str, data: bytes):
+        """Store bytes under key, then evict old entries if over the size limit."""
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            try:
+                replaced_bytes = os.stat(path).st_size
+            except FileNotFoundError:
+                replaced_bytes = 0
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+        self._total_bytes += len(data) - replaced_bytes
+        if self._total_bytes > self.max_bytes:
+            self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in max_bytes."""
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+        self._total_bytes = total
+
+
+class CertificateRenderer:
+    """
+    Renders certificates for many recipients from one preloaded template.
+    The template pixels, font and colour are resolved once; each call to
+    render() draws onto a copy of the decoded template.
+    """
+
+    def __init__(self, template_path: str, text_position: Optional[Tuple[int, int]] = None,
+                 font_size: int = 80, font_color: str = '#000000',
+                 auto_position: bool = False, detected_line_y: Optional[int] = None,
+                 vertical_offset: int = 0, output_format: str = 'png',
+                 quality: int = 85, png_compress_level: int = 6,
+                 cache: Optional[CertificateCache] = None):
+        if not PIL_AVAILABLE:
+            raise ImportError("Pillow is required for certificate generation. Install with: pip install Pillow")
+        if output_format not in CERTIFICATE_OUTPUT_FORMATS:
+            raise ValueError(f"Unknown certificate output format: {output_format}")
+
+        self.template_path = template_path
+        self.text_position = text_position
+        self.font_size = font_size
+        self.font_color = font_color
+        self.auto_position = auto_position
+        self.vertical_offset = vertical_offset
+        self.output_format = output_format
+        self.quality = quality
+        self.png_compress_level = png_compress_level
+        self.last_encode_seconds = 0.0
+        self.cache = cache
+        self.last_cache_hit: Optional[bool] = None
+
+        # Decode the template once; render() only copies the pixel buffer
+        with open(template_path, 'rb') as f:
+            template_bytes = f.read()
+        self.template_hash = hashlib.sha256(template_bytes).hexdigest()
+        with Image.open(BytesIO(template_bytes)) as img:
+            img.load()
+            self.template = img.copy()
+
+        self.font = load_certificate_font(font_size)
+        self.rgb_color = parse_hex_color(font_color)
+
+        if auto_position and detected_line_y is None:
+            detected_line_y = analyze_template(template_path, content_hash=self.template_hash)['detected_line_y']
+        self.detected_line_y = detected_line_y
+
+    @classmethod
+    def from_config(cls, cert_config: Dict) -> 'CertificateRenderer':
+        """Build a renderer from the dict returned by prompt_certificate_config()."""
+        cache = None
+        if cert_config.get('cache_dir'):
+            cache = CertificateCache(cert_config['cache_dir'],
+                                     int(cert_config.get('cache_max_mb', 500) * 1024 * 1024))
+        return cls(
+            cert_config['template_path'],
+            cert_config.get('text_position'),
+            cert_config.get('font_size', 80),
+            cert_config.get('font_color', '#000000'),
+            auto_position=cert_config.get('auto_position', False),
+            detected_line_y=cert_config.get('detected_line_y'),
+            vertical_offset=cert_config.get('vertical_offset', 0),
+            output_format=cert_config.get('output_format', 'png'),
+            quality=cert_config.get('quality', 85),
+            png_compress_level=cert_config.get('png_compress_level', 6),
+            cache=cache
+        )
+
+    @property
+    def extension(self) -> str:
+        """File extension for the configured output format."""
+        return CERTIFICATE_OUTPUT_FORMATS[self.output_format]['extension']
+
+    @property
+    def mime_type(self) -> str:
+        """MIME type for the configured output format."""
+        return CERTIFICATE_OUTPUT_FORMATS[self.output_format]['mime_type']
+
+    def cache_key(self, name: str) -> str:
+        """Hash of every input that affects the rendered certificate bytes."""
+        key_parts = [
+            self.template_hash, name.upper(), getattr(self.font, 'path', 'default'),
+            self.font_size, self.rgb_color, self.text_position, self.auto_position,
+            self.detected_line_y, self.vertical_offset, self.output_format,
+            self.quality, self.png_compress_level
+        ]
+        return hashlib.sha256(json.dumps(key_parts).encode('utf-8')).hexdigest()
+
+    def render(self, name: str) -> BytesIO:
+        """
+        Generate a certificate by overlaying name on a copy of the template.
+        Returns BytesIO object containing the encoded image, served from
+        the disk cache when the same certificate was rendered before.
+        """
+        if self.cache is None:
+            return self.encode(self.draw_name(name))
+
+        key = self.cache_key(name)
+        data = self.cache.get(key)
+        self.last_cache_hit = data is not None
+        if data is not None:
+            self.last_encode_seconds = 0.0
+            return BytesIO(data)
+
+        output = self.encode(self.draw_name(name))
+        self.cache.put(key, output.getvalue())
+        return output
+
+    def draw_name(self, name: str):
+        """Return a copy of the template with the name drawn on it."""
+        img = self.template.copy()
+        draw = ImageDraw.Draw(img)
+        font = self.font
+
+        # Prepare text metrics
+        text = name.upper()
+
+        if hasattr(draw, "textbbox"):
+            bbox = draw.textbbox((0, 0), text, font=font)
+            text_width = bbox[2] - bbox[0]
+            text_height = bbox[3] - bbox[1]
+        else:
+            text_width, text_height = draw.textsize(text, font=font)
+
+        text_x, text_y = 0, 0
+        text_position = self.text_position
+
+        if self.auto_position:
+            if self.detected_line_y is not None:
+                text_x = max(0, (img.width - text_width) // 2)
+                margin = max(5, text_height // 6)
+                text_y = max(0, self.detected_line_y - text_height - margin)
+            elif text_position:
+                text_x, text_y = text_position
+            else:
+                text_x = max(0, (img.width - text_width) // 2)
+                text_y = max(0, (img.height - text_height) // 2)
+        else:
+            if not text_position:
+                raise ValueError("Manual text positioning selected but no coordinates were provided.")
+            text_x, text_y = text_position
+
+        text_y = max(0, min(img.height - text_height, text_y + self.vertical_offset))
+
+        # Draw text (name in UPPERCASE)
+        draw.text((text_x, text_y), text, fill=self.rgb_color, font=font)
+
+        return img
+
+    def encode(self, img) -> BytesIO:
+        """
+        Encode a drawn certificate in the configured output format.
+        The time spent is kept in last_encode_seconds.
+        """
+        fmt = self.output_format
+        save_kwargs = {}
+
+        start = time.perf_counter()
+        if fmt == 'png':
+            save_kwargs['compress_level'] = self.png_compress_level
+        elif fmt == 'png-palette':
+            img = img.convert('RGB').quantize(colors=256)
+            save_kwargs['compress_level'] = self.png_compress_level
+            save_kwargs['optimize'] = True
+        elif fmt in ('jpeg', 'webp'):
+            img = img.convert('RGB')
+            save_kwargs['quality'] = self.quality
+        elif fmt == 'pdf':
+            img = img.convert('RGB')
+
+        # Save to BytesIO
+        output = BytesIO()
+        img.save(output, format=CERTIFICATE_OUTPUT_FORMATS[fmt]['pil_format'], **save_kwargs)
+        output.seek(0)
+        self.last_encode_seconds = time.perf_counter() - start
+
+        return output
+
+
+def benchmark_certificate_formats(cert_config: Dict, sample_name: str = 'Sample Name') -> List[Tuple[str, float, int]]:
+    """
+    Encode one sample certificate in every output format.
+    Returns a list of (format_key, encode_seconds, size_bytes).
+    """
+    renderer = CertificateRenderer.from_config(cert_config)
+    img = renderer.draw_name(sample_name)
+
+    results = []
+    for fmt in CERTIFICATE_OUTPUT_FORMATS:
+        renderer.output_format = fmt
+        try:
+            size = len(renderer.encode(img).getvalue())
+        except Exception:
+            continue
+        results.append((fmt, renderer.last_encode_seconds, size))
+    return results
+
+
 def generate_certificate(template_path: str, name: str, text_position: Optional[Tuple[int, int]], 
                         font_size: int = 80, font_color: str = '#000000', 
                         auto_position: bool = False, detected_line_y: Optional[int] = None,
-                        vertical_offset: int = 0) -> BytesIO:
+                        vertical_offset: int = 0, output_format: str = 'png') -> BytesIO:
     """
     Generate a certificate by overlaying name on template image.
-    Returns BytesIO object containing the PNG image.
+    Returns BytesIO object containing the certificate encoded as
+    output_format (a CERTIFICATE_OUTPUT_FORMATS key).
+
+    One-off helper; use CertificateRenderer when rendering many names.
     """
-    if not PIL_AVAILABLE:
-        raise ImportError("Pillow is required for certificate generation. Install with: pip install Pillow")
-    
-    # Open template image
-    img = Image.open(template_path)
-    draw = ImageDraw.Draw(img)
-    
-    # Try to use a nice font, fall back to default if not available
+    renderer = CertificateRenderer(template_path, text_position, font_size, font_color,
+                                   auto_position=auto_position, detected_line_y=detected_line_y,
+                                   vertical_offset=vertical_offset, output_format=output_format)
+    return renderer.render(name)
+
+# Per-process renderer used by the parallel certificate pool
+_worker_renderer: Optional[CertificateRenderer] = None
+_worker_init_error: Optional[str] = None
+
+
+def _init_certificate_worker(cert_config: Dict):
+    """Pool initializer: load the template and font once per worker process."""
+    global _worker_renderer, _worker_init_error
     try:
-        # Try common font paths
-        font_paths = [
-            "/usr/share/fonts/truetype/msttcorefonts/ScriptMTBold.ttf",
-            "/usr/share/fonts/truetype/scriptmt/ScriptMTBold.ttf",
-            "/usr/share/fonts/truetype/scriptmt/script.ttf",
-            "/usr/share/fonts/truetype/msttcorefonts/SCRIPTBL.TTF",
-            "/Library/Fonts/ScriptMTBold.ttf",
-            "/System/Library/Fonts/Supplemental/ScriptMTBold.ttf",
-            "C:\\Windows\\Fonts\\SCRIPTBL.TTF",
-            "C:\\Windows\\Fonts\\ScriptMTBold.ttf",
-            "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
-            "/System/Library/Fonts/Helvetica.ttc",
-            "C:\\Windows\\Fonts\\Arial.ttf",
-            "/usr/share/fonts/truetype/liberation/LiberationSans-Bold.ttf"
-        ]
-        font = None
-        for font_path in font_paths:
-            if os.path.exists(font_path):
-                font = ImageFont.truetype(font_path, font_size)
-                break
-        if font is None:
-            font = ImageFont.load_default()
-    except:
-        font = ImageFont.load_default()
-    
-    # Convert color hex to RGB
-    if font_color.startswith('#'):
-        font_color = font_color.lstrip('#')
-        rgb_color = tuple(int(font_color[i:i+2], 16) for i in (0, 2, 4))
-    else:
-        rgb_color = (0, 0, 0)  # Default black
-    
-    # Prepare text metrics
-    text = name.upper()
+        _worker_renderer = CertificateRenderer.from_config(cert_config)
+    except Exception as e:
+        _worker_init_error = str(e)
+
+
+def _render_certificate_task(name: str) -> Tuple[Optional[bytes], Optional[str], float, Optional[bool]]:
+    """Render one certificate in a worker. Returns (image_bytes, error, encode_seconds, cache_hit)."""
+    if _worker_renderer is None:
+        return None, _worker_init_error or "Certificate renderer not initialized", 0.0, None
+    try:
+        data = _worker_renderer.render(name).getvalue()
+        return data, None, _worker_renderer.last_encode_seconds, _worker_renderer.last_cache_hit
+    except Exception as e:
+        return None, str(e), 0.0, None
+
+
+def render_certificates_parallel(cert_config: Dict, names: Iterable[str], workers: int,
+                                 prefetch: Optional[int] = None) -> Iterator[Tuple[Optional[BytesIO], Optional[str], float, Optional[bool]]]:
+    """
+    Render certificates in a process pool ahead of the consumer.
+    Yields (attachment, error, encode_seconds, cache_hit) in the same order as names. At most `prefetch`
+    renders (default: 2 per worker) are in flight or waiting to be consumed.
+    """
+    prefetch = prefetch or workers * 2
+    names = iter(names)
+    pending = deque()
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_certificate_worker,
+                             initargs=(cert_config,)) as executor:
+        for name in islice(names, prefetch):
+            pending.append(executor.submit(_render_certificate_task, name))
 
-    if hasattr(draw, "textbbox"):
-        bbox = draw.textbbox((0, 0), text, font=font)
-        text_width = bbox[2] - bbox[0]
-        text_height = bbox[3] - bbox[1]
+        while pending:
+            future = pending.popleft()
+            for name in islice(names, 1):
+                pending.append(executor.submit(_render_certificate_task, name))
+
+            try:
+                data, error, encode_seconds, cache_hit = future.result()
+            except Exception as e:
+                data, error, encode_seconds, cache_hit = None, str(e), 0.0, None
+
+            yield (BytesIO(data) if data is not None else None), error, encode_seconds, cache_hit
+
+
+def certificate_filename(name: str, extension: str = 'png') -> str:
+    """Attachment/export filename for a recipient's certificate."""
+    safe_name = re.sub(r'[\s\\/:*?"<>|]', '_', name.upper())
+    return f"certificate_{safe_name}.{extension}"
+
+
+def export_certificates(rows_data: Iterable[Dict[str, str]], cert_config: Dict, export_path: str,
+                        total: Optional[int] = None) -> Dict[str, int]:
+    """
+    Render every certificate into a directory, or a ZIP archive when
+    export_path ends in .zip, without sending any email.
+    Rows are read lazily and certificates are streamed to disk one at a
+    time, so memory stays flat however many rows there are.
+    total is the number of certificates to render, if known, for progress.
+    Returns counts of exported, failed and skipped rows.
+    """
+    counts = {'exported': 0, 'failed': 0, 'skipped': 0}
+    extension = CERTIFICATE_OUTPUT_FORMATS[cert_config.get('output_format', 'png')]['extension']
+
+    def named_rows():
+        for row in rows_data:
+            name = row.get('Name', '').strip()
+            if name:
+                yield name
+            else:
+                counts['skipped'] += 1
+
+    # One copy of the names feeds the renderer, which may run ahead; the other labels its results
+    render_names, valid_names = tee(named_rows())
+
+    render_workers = cert_config.get('render_workers', 1)
+    if render_workers > 1:
+        results = render_certificates_parallel(cert_config, render_names, render_workers)
     else:
-        text_width, text_height = draw.textsize(text, font=font)
+        renderer = CertificateRenderer.from_config(cert_config)
 
-    text_x, text_y = 0, 0
+        def render_serial():
+            for name in render_names:
+                try:
+                    yield renderer.render(name), None, renderer.last_encode_seconds, renderer.last_cache_hit
+                except Exception as e:
+                    yield None, str(e), 0.0, None
 
-    if auto_position:
-        if detected_line_y is None:
-            detected_line_y, _ = detect_horizontal_guideline(template_path)
+        results = render_serial()
 
-        if detected_line_y is not None:
-            text_x = max(0, (img.width - text_width) // 2)
-            margin = max(5, text_height // 6)
-            text_y = max(0, detected_line_y - text_height - margin)
-        elif text_position:
-            text_x, text_y = text_position
-        else:
-            text_x = max(0, (img.width - text_width) // 2)
-            text_y = max(0, (img.height - text_height) // 2)
+    to_zip = export_path.lower().endswith('.zip')
+    if to_zip:
+        archive = zipfile.ZipFile(export_path, 'w', compression=zipfile.ZIP_STORED)
     else:
-        if not text_position:
-            raise ValueError("Manual text positioning selected but no coordinates were provided.")
-        text_x, text_y = text_position
+        archive = None
+        os.makedirs(export_path, exist_ok=True)
 
-    text_y = max(0, min(img.height - text_height, text_y + vertical_offset))
+    used_filenames = set()
+    start = time.perf_counter()
+    last_progress = 0.0
+    done = 0
+    try:
+        for done, (name, (attachment, error, _, _)) in enumerate(zip(valid_names, results), 1):
+            if error:
+                print(f"\n⚠ Warning: Could not generate certificate for {name}: {error}")
+                counts['failed'] += 1
+            else:
+                # Keep same-named recipients from overwriting each other
+                filename = certificate_filename(name, extension)
+                stem = filename[:-(len(extension) + 1)]
+                suffix = 2
+                while filename in used_filenames:
+                    filename = f"{stem}_{suffix}.{extension}"
+                    suffix += 1
+                used_filenames.add(filename)
+
+                if archive is not None:
+                    archive.writestr(filename, attachment.getvalue())
+                else:
+                    with open(os.path.join(export_path, filename), 'wb') as f:
+                        f.write(attachment.getbuffer())
+                counts['exported'] += 1
+
+            elapsed = time.perf_counter() - start
+            if elapsed - last_progress >= 0.5:
+                last_progress = elapsed
+                print(f"\r  {progress_label(done, total)} certificates rendered ({done / elapsed:.1f}/s)",
+                      end='', flush=True)
+        
+        elapsed = time.perf_counter() - start
+        rate = done / elapsed if elapsed > 0 else 0.0
+        print(f"\r  {progress_label(done, total)} certificates rendered ({rate:.1f}/s)", end='', flush=True)
+    finally:
+        if archive is not None:
+            archive.close()
+        results.close()
+    print()
 
-    # Draw text (name in UPPERCASE)
-    draw.text((text_x, text_y), text, fill=rgb_color, font=font)
-    
-    # Save to BytesIO
-    output = BytesIO()
-    img.save(output, format='PNG')
-    output.seek(0)
-    
-    return output
+    return counts
 
 # ============================================================================
 # EMAIL RENDERING
 # ============================================================================
 
-def render_certificate_html(row_dict: Dict[str, str]) -> str:
-    """Render thank-you HTML email with dynamic sections and defaults."""
-    html = CERTIFICATE_HTML_TEMPLATE
-
-    defaults = {
-        'OrgName': 'IEEE BAU',
-        'SupportEmail': 'IEEE.BAU.LB@gmail.com',
-        'Year': str(datetime.now().year),
-        'TeamOrSignerName': 'Mohamad Al Ghoush',
-        'Title': ''
-    }
+CERTIFICATE_DEFAULTS = {
+    'OrgName': 'IEEE BAU',
+    'SupportEmail': 'IEEE.BAU.LB@gmail.com',
+    'TeamOrSignerName': 'Mohamad Al Ghoush',
+    'Title': ''
+}
+
 
+def build_certificate_context(row_dict: Dict[str, str]) -> Dict[str, str]:
+    """
+    Derive every field the thank-you HTML and text templates need, once per row.
+    Applies defaults and the CourseTitle/CompletionDate fallbacks on a copy;
+    row_dict itself is not modified. The attachment wording follows the
+    CertificateFormat field (a CERTIFICATE_OUTPUT_FORMATS key, default png).
+    """
+    context = dict(row_dict)
+
+    defaults = dict(CERTIFICATE_DEFAULTS, Year=str(datetime.now().year))
     for key, default_value in defaults.items():
-        if key not in row_dict or not str(row_dict[key]).strip():
-            row_dict[key] = default_value
+        if key not in context or not str(context[key]).strip():
+            context[key] = default_value
 
     # Backwards compatibility with previous column names
-    if not str(row_dict.get('EventName', '')).strip() and str(row_dict.get('CourseTitle', '')).strip():
-        row_dict['EventName'] = row_dict['CourseTitle'].strip()
-    if not str(row_dict.get('EventDate', '')).strip() and str(row_dict.get('CompletionDate', '')).strip():
-        row_dict['EventDate'] = row_dict['CompletionDate'].strip()
+    if not str(context.get('EventName', '')).strip() and str(context.get('CourseTitle', '')).strip():
+        context['EventName'] = context['CourseTitle'].strip()
+    if not str(context.get('EventDate', '')).strip() and str(context.get('CompletionDate', '')).strip():
+        context['EventDate'] = context['CompletionDate'].strip()
 
-    event_name = str(row_dict.get('EventName', '')).strip()
-    event_date = str(row_dict.get('EventDate', '')).strip()
-    event_location = str(row_dict.get('EventLocation', '')).strip()
-    org_name = row_dict.get('OrgName', 'our organization')
+    event_name = str(context.get('EventName', '')).strip()
+    event_date = str(context.get('EventDate', '')).strip()
+    event_location = str(context.get('EventLocation', '')).strip()
+    org_name = context.get('OrgName', 'our organization')
 
     if event_name and event_date:
         thank_you_message = (
             f"Thank you for attending <strong>{event_name}</strong> on <strong>{event_date}</strong>. "
             f"Your presence helped make the experience memorable for our community at {org_name}."
         )
+        thank_you_plain = (
+            f"Thank you for attending {event_name} on {event_date}. "
+            f"Your presence helped make the experience memorable for our community at {org_name}."
+        )
     elif event_name:
         thank_you_message = (
             f"Thank you for attending <strong>{event_name}</strong>. "
             "We truly appreciated having you with us."
         )
+        thank_you_plain = (
+            f"Thank you for attending {event_name}. We truly appreciated having you with us."
+        )
     else:
         thank_you_message = (
             "Thank you for attending our recent gathering. We truly appreciated having you with us."
         )
+        thank_you_plain = thank_you_message
 
+    cert_format = CERTIFICATE_OUTPUT_FORMATS.get(str(context.get('CertificateFormat', '')).strip(),
+                                                 CERTIFICATE_OUTPUT_FORMATS['png'])
     attachment_line = (
-        "Your certificate of appreciation is attached to this email as a PNG image. "
+        f"Your certificate of appreciation is attached to this email as {cert_format['description']}. "
         "Feel free to download, print, or share it as you wish."
     )
 
     # Event details card
     detail_lines: List[str] = []
+    detail_lines_plain: List[str] = []
     if event_name:
         detail_lines.append(
             f'<p style="margin: 0 0 8px; font-size: 14px; color: #4a5568; line-height: 1.6;">'
             f'<strong>Event:</strong> {event_name}</p>'
         )
+        detail_lines_plain.append(f"Event: {event_name}")
     if event_date:
         detail_lines.append(
             f'<p style="margin: 0 0 8px; font-size: 14px; color: #4a5568; line-height: 1.6;">'
             f'<strong>Date:</strong> {event_date}</p>'
         )
+        detail_lines_plain.append(f"Date: {event_date}")
     if event_location:
         detail_lines.append(
             f'<p style="margin: 0; font-size: 14px; color: #4a5568; line-height: 1.6;">'
             f'<strong>Location:</strong> {event_location}</p>'
         )
+        detail_lines_plain.append(f"Location: {event_location}")
 
     if detail_lines:
         event_details_html = (
@@ -750,12 +1718,14 @@ def render_certificate_html(row_dict: Dict[str, str]) -> str:
             + ''.join(detail_lines) +
             '</td></tr></table>'
         )
+        event_details_block = "EVENT DETAILS\n" + "\n".join(detail_lines_plain) + "\n\n"
     else:
         event_details_html = ''
+        event_details_block = ""
 
     # Resources section
-    resources_url = str(row_dict.get('ResourcesURL', '')).strip()
-    resources_desc = str(row_dict.get('ResourcesDescription', '')).strip()
+    resources_url = str(context.get('ResourcesURL', '')).strip()
+    resources_desc = str(context.get('ResourcesDescription', '')).strip()
     if resources_url:
         resources_label = resources_desc or 'Access post-event resources'
         resources_html = (
@@ -768,143 +1738,72 @@ def render_certificate_html(row_dict: Dict[str, str]) -> str:
             f'{resources_label}</a>'
             '</td></tr></table>'
         )
+        resources_block = f"RESOURCES\n{resources_label}: {resources_url}\n\n"
     else:
         resources_html = ''
+        resources_block = ""
 
     # Feedback section
-    feedback_url = str(row_dict.get('FeedbackURL', '')).strip()
+    feedback_url = str(context.get('FeedbackURL', '')).strip()
     if feedback_url:
         feedback_html = (
             '<table role="presentation" cellspacing="0" cellpadding="0" border="0" width="100%" '
             'style="background-color: #fdf2f8; border-radius: 6px; margin-bottom: 30px;">'
             '<tr><td style="padding: 24px; text-align: center;">'
-            '<p style="margin: 0 0 8px; font-size: 16px; color: #2d3748;">💬 <strong>Share your feedback</strong></p>'
-            f'<a href="{feedback_url}" style="display: inline-block; margin-top: 12px; padding: 12px 32px; '
-            'background-color: #d53f8c; color: #ffffff; text-decoration: none; font-size: 15px; border-radius: 6px;">'
-            'Complete the feedback form</a>'
-            '</td></tr></table>'
-        )
-    else:
-        feedback_html = ''
-
-    footer_parts = []
-    if str(row_dict.get('OrgAddress', '')).strip():
-        footer_parts.append(row_dict['OrgAddress'].strip())
-    if str(row_dict.get('SupportEmail', '')).strip():
-        footer_parts.append(row_dict['SupportEmail'].strip())
-    if str(row_dict.get('OrgPhone', '')).strip():
-        footer_parts.append(row_dict['OrgPhone'].strip())
-    footer_contact = ' • '.join(footer_parts) if footer_parts else 'Stay connected with us'
-
-    html = html.replace('{ThankYouMessage}', thank_you_message)
-    html = html.replace('{AttachmentLine}', attachment_line)
-    html = html.replace('{EventDetailsSection}', event_details_html)
-    html = html.replace('{ResourcesSection}', resources_html)
-    html = html.replace('{FeedbackSection}', feedback_html)
-    html = html.replace('{FooterContact}', footer_contact)
-
-    for key, value in row_dict.items():
-        html = html.replace(f'{{{key}}}', str(value))
-
-    return html
-
-def render_certificate_text(row_dict: Dict[str, str]) -> str:
-    """Render thank-you plain text email with defaults for missing fields."""
-    text = CERTIFICATE_TEXT_TEMPLATE
-
-    defaults = {
-        'OrgName': 'IEEE BAU',
-        'SupportEmail': 'IEEE.BAU.LB@gmail.com',
-        'Year': str(datetime.now().year),
-        'TeamOrSignerName': 'Mohamad Al Ghoush',
-        'Title': ''
-    }
-
-    for key, default_value in defaults.items():
-        if key not in row_dict or not str(row_dict[key]).strip():
-            row_dict[key] = default_value
-
-    # Backwards compatibility
-    if not str(row_dict.get('EventName', '')).strip() and str(row_dict.get('CourseTitle', '')).strip():
-        row_dict['EventName'] = row_dict['CourseTitle'].strip()
-    if not str(row_dict.get('EventDate', '')).strip() and str(row_dict.get('CompletionDate', '')).strip():
-        row_dict['EventDate'] = row_dict['CompletionDate'].strip()
-
-    event_name = str(row_dict.get('EventName', '')).strip()
-    event_date = str(row_dict.get('EventDate', '')).strip()
-    event_location = str(row_dict.get('EventLocation', '')).strip()
-    org_name = row_dict.get('OrgName', 'our organization')
-
-    if event_name and event_date:
-        thank_you_plain = (
-            f"Thank you for attending {event_name} on {event_date}. "
-            f"Your presence helped make the experience memorable for our community at {org_name}."
-        )
-    elif event_name:
-        thank_you_plain = (
-            f"Thank you for attending {event_name}. We truly appreciated having you with us."
-        )
-    else:
-        thank_you_plain = (
-            "Thank you for attending our recent gathering. We truly appreciated having you with us."
-        )
-
-    attachment_line_plain = (
-        "Your certificate of appreciation is attached to this email as a PNG image. "
-        "Feel free to download, print, or share it as you wish."
-    )
-
-    detail_lines: List[str] = []
-    if event_name:
-        detail_lines.append(f"Event: {event_name}")
-    if event_date:
-        detail_lines.append(f"Date: {event_date}")
-    if event_location:
-        detail_lines.append(f"Location: {event_location}")
-
-    if detail_lines:
-        event_details_block = "EVENT DETAILS\n" + "\n".join(detail_lines) + "\n\n"
-    else:
-        event_details_block = ""
-
-    resources_url = str(row_dict.get('ResourcesURL', '')).strip()
-    resources_desc = str(row_dict.get('ResourcesDescription', '')).strip()
-    if resources_url:
-        resources_label = resources_desc or 'Access post-event resources'
-        resources_block = f"RESOURCES\n{resources_label}: {resources_url}\n\n"
-    else:
-        resources_block = ""
-
-    feedback_url = str(row_dict.get('FeedbackURL', '')).strip()
-    if feedback_url:
+            '<p style="margin: 0 0 8px; font-size: 16px; color: #2d3748;">💬 <strong>Share your feedback</strong></p>'
+            f'<a href="{feedback_url}" style="display: inline-block; margin-top: 12px; padding: 12px 32px; '
+            'background-color: #d53f8c; color: #ffffff; text-decoration: none; font-size: 15px; border-radius: 6px;">'
+            'Complete the feedback form</a>'
+            '</td></tr></table>'
+        )
         feedback_block = f"FEEDBACK\nShare your thoughts: {feedback_url}\n\n"
     else:
+        feedback_html = ''
         feedback_block = ""
 
     footer_parts = []
-    if str(row_dict.get('OrgAddress', '')).strip():
-        footer_parts.append(row_dict['OrgAddress'].strip())
-    if str(row_dict.get('SupportEmail', '')).strip():
-        footer_parts.append(row_dict['SupportEmail'].strip())
-    if str(row_dict.get('OrgPhone', '')).strip():
-        footer_parts.append(row_dict['OrgPhone'].strip())
-    footer_contact = ' | '.join(footer_parts) if footer_parts else 'Stay connected with us'
-
-    text = text.replace('{ThankYouMessagePlain}', thank_you_plain)
-    text = text.replace('{AttachmentLinePlain}', attachment_line_plain)
-    text = text.replace('{EventDetailsBlock}', event_details_block)
-    text = text.replace('{ResourcesBlock}', resources_block)
-    text = text.replace('{FeedbackBlock}', feedback_block)
-    text = text.replace('{FooterContactText}', footer_contact)
-
-    for key, value in row_dict.items():
-        text = text.replace(f'{{{key}}}', str(value))
-
-    return text
-
-def render_event_html(row_dict: Dict[str, str]) -> str:
-    """Render Event HTML with dynamic sections."""
-    html = EVENT_HTML_TEMPLATE
+    if str(context.get('OrgAddress', '')).strip():
+        footer_parts.append(context['OrgAddress'].strip())
+    if str(context.get('SupportEmail', '')).strip():
+        footer_parts.append(context['SupportEmail'].strip())
+    if str(context.get('OrgPhone', '')).strip():
+        footer_parts.append(context['OrgPhone'].strip())
+
+    context.update({
+        'ThankYouMessage': thank_you_message,
+        'ThankYouMessagePlain': thank_you_plain,
+        'AttachmentLine': attachment_line,
+        'AttachmentLinePlain': attachment_line,
+        'EventDetailsSection': event_details_html,
+        'EventDetailsBlock': event_details_block,
+        'ResourcesSection': resources_html,
+        'ResourcesBlock': resources_block,
+        'FeedbackSection': feedback_html,
+        'FeedbackBlock': feedback_block,
+        'FooterContact': ' • '.join(footer_parts) if footer_parts else 'Stay connected with us',
+        'FooterContactText': ' | '.join(footer_parts) if footer_parts else 'Stay connected with us'
+    })
+
+    return context
+
+def render_certificate_html(row_dict: Dict[str, str], context: Optional[Dict[str, str]] = None) -> str:
+    """Render thank-you HTML email with dynamic sections and defaults."""
+    if context is None:
+        context = build_certificate_context(row_dict)
+    return get_compiled_template('certificate', 'html').render(context)
+
+def render_certificate_text(row_dict: Dict[str, str], context: Optional[Dict[str, str]] = None) -> str:
+    """Render thank-you plain text email with defaults for missing fields."""
+    if context is None:
+        context = build_certificate_context(row_dict)
+    return get_compiled_template('certificate', 'text').render(context)
+
+def build_event_context(row_dict: Dict[str, str]) -> Dict[str, str]:
+    """
+    Derive the outcomes, speakers, footer and unsubscribe sections for the
+    event HTML and text templates, once per row. row_dict is not modified.
+    """
+    context = dict(row_dict)
     
     # Hero image section
     hero_section = ""
@@ -917,35 +1816,38 @@ def render_event_html(row_dict: Dict[str, str]) -> str:
     
     # Outcomes section
     outcomes_html = ""
+    outcomes_text = ""
     outcome1 = row_dict.get('Outcome1', '').strip()
     outcome2 = row_dict.get('Outcome2', '').strip()
     if outcome1 or outcome2:
         outcomes_html = '<p style="margin: 0 0 12px; font-size: 16px; color: #2d3748; line-height: 1.6;"><strong>Key Outcomes:</strong></p><ul style="margin: 0 0 30px; padding-left: 24px; font-size: 16px; color: #2d3748; line-height: 1.8;">'
-        if outcome1:
-            outcomes_html += f'<li>{outcome1}</li>'
-        if outcome2:
-            outcomes_html += f'<li>{outcome2}</li>'
+        outcomes_text = "KEY OUTCOMES\n"
+        for outcome in (outcome1, outcome2):
+            if outcome:
+                outcomes_html += f'<li>{outcome}</li>'
+                outcomes_text += f"- {outcome}\n"
         outcomes_html += '</ul>'
     
     # Speakers section
     speakers_html = ""
-    speaker1_name = row_dict.get('Speaker1Name', '').strip()
-    speaker1_title = row_dict.get('Speaker1Title', '').strip()
-    speaker2_name = row_dict.get('Speaker2Name', '').strip()
-    speaker2_title = row_dict.get('Speaker2Title', '').strip()
+    speakers_text = ""
+    speakers = [
+        (row_dict.get('Speaker1Name', '').strip(), row_dict.get('Speaker1Title', '').strip()),
+        (row_dict.get('Speaker2Name', '').strip(), row_dict.get('Speaker2Title', '').strip())
+    ]
     
-    if speaker1_name or speaker2_name:
+    if speakers[0][0] or speakers[1][0]:
         speakers_html = '<p style="margin: 0 0 12px; font-size: 16px; color: #2d3748; line-height: 1.6;"><strong>Featured Speakers:</strong></p><ul style="margin: 0 0 30px; padding-left: 24px; font-size: 16px; color: #2d3748; line-height: 1.8;">'
-        if speaker1_name:
-            speakers_html += f'<li><strong>{speaker1_name}</strong>'
-            if speaker1_title:
-                speakers_html += f', {speaker1_title}'
-            speakers_html += '</li>'
-        if speaker2_name:
-            speakers_html += f'<li><strong>{speaker2_name}</strong>'
-            if speaker2_title:
-                speakers_html += f', {speaker2_title}'
-            speakers_html += '</li>'
+        speakers_text = "FEATURED SPEAKERS\n"
+        for speaker_name, speaker_title in speakers:
+            if speaker_name:
+                speakers_html += f'<li><strong>{speaker_name}</strong>'
+                speakers_text += f"- {speaker_name}"
+                if speaker_title:
+                    speakers_html += f', {speaker_title}'
+                    speakers_text += f", {speaker_title}"
+                speakers_html += '</li>'
+                speakers_text += "\n"
         speakers_html += '</ul>'
     
     # Footer contact
@@ -953,95 +1855,163 @@ def render_event_html(row_dict: Dict[str, str]) -> str:
     if row_dict.get('OrgAddress', '').strip():
         footer_parts.append(row_dict['OrgAddress'])
     footer_parts.append(row_dict['SupportEmail'])
-    footer_contact = ' • '.join(footer_parts)
     
     # Unsubscribe section
     unsubscribe_html = ""
+    unsubscribe_text = ""
     if row_dict.get('UnsubscribeURL', '').strip():
         unsubscribe_html = f'''<p style="margin: 0 0 12px; font-size: 12px; color: #a0aec0; line-height: 1.5; text-align: center;">
             <a href="{row_dict['UnsubscribeURL']}" style="color: #a0aec0; text-decoration: underline;">Unsubscribe from event invitations</a>
         </p>'''
+        unsubscribe_text = f"Unsubscribe: {row_dict['UnsubscribeURL']}"
     
-    # Replace special sections
-    html = html.replace('{HeroImageSection}', hero_section)
-    html = html.replace('{OutcomesSection}', outcomes_html)
-    html = html.replace('{SpeakersSection}', speakers_html)
-    html = html.replace('{FooterContact}', footer_contact)
-    html = html.replace('{UnsubscribeSection}', unsubscribe_html)
-    
-    # Replace all placeholders
-    for key, value in row_dict.items():
-        html = html.replace(f'{{{key}}}', str(value))
-    
-    return html
+    # Special sections take precedence over row fields
+    context.update({
+        'HeroImageSection': hero_section,
+        'OutcomesSection': outcomes_html,
+        'OutcomesText': outcomes_text,
+        'SpeakersSection': speakers_html,
+        'SpeakersText': speakers_text,
+        'FooterContact': ' • '.join(footer_parts),
+        'FooterContactText': ' | '.join(footer_parts),
+        'UnsubscribeSection': unsubscribe_html,
+        'UnsubscribeText': unsubscribe_text
+    })
+    
+    return context
+
+def render_event_html(row_dict: Dict[str, str], context: Optional[Dict[str, str]] = None) -> str:
+    """Render Event HTML with dynamic sections."""
+    if context is None:
+        context = build_event_context(row_dict)
+    return get_compiled_template('event', 'html').render(context)
 
-def render_event_text(row_dict: Dict[str, str]) -> str:
+def render_event_text(row_dict: Dict[str, str], context: Optional[Dict[str, str]] = None) -> str:
     """Render Event plain text."""
-    text = EVENT_TEXT_TEMPLATE
-    
-    # Outcomes text
-    outcomes_text = ""
-    outcome1 = row_dict.get('Outcome1', '').strip()
-    outcome2 = row_dict.get('Outcome2', '').strip()
-    if outcome1 or outcome2:
-        outcomes_text = "KEY OUTCOMES\n"
-        if outcome1:
-            outcomes_text += f"- {outcome1}\n"
-        if outcome2:
-            outcomes_text += f"- {outcome2}\n"
-    
-    # Speakers text
-    speakers_text = ""
-    speaker1_name = row_dict.get('Speaker1Name', '').strip()
-    speaker1_title = row_dict.get('Speaker1Title', '').strip()
-    speaker2_name = row_dict.get('Speaker2Name', '').strip()
-    speaker2_title = row_dict.get('Speaker2Title', '').strip()
-    
-    if speaker1_name or speaker2_name:
-        speakers_text = "FEATURED SPEAKERS\n"
-        if speaker1_name:
-            speakers_text += f"- {speaker1_name}"
-            if speaker1_title:
-                speakers_text += f", {speaker1_title}"
-            speakers_text += "\n"
-        if speaker2_name:
-            speakers_text += f"- {speaker2_name}"
-            if speaker2_title:
-                speakers_text += f", {speaker2_title}"
-            speakers_text += "\n"
-    
-    # Footer contact
-    footer_parts = []
-    if row_dict.get('OrgAddress', '').strip():
-        footer_parts.append(row_dict['OrgAddress'])
-    footer_parts.append(row_dict['SupportEmail'])
-    footer_contact = ' | '.join(footer_parts)
-    
-    # Unsubscribe text
-    unsubscribe_text = ""
-    if row_dict.get('UnsubscribeURL', '').strip():
-        unsubscribe_text = f"Unsubscribe: {row_dict['UnsubscribeURL']}"
-    
-    text = text.replace('{OutcomesText}', outcomes_text)
-    text = text.replace('{SpeakersText}', speakers_text)
-    text = text.replace('{FooterContactText}', footer_contact)
-    text = text.replace('{UnsubscribeText}', unsubscribe_text)
-    
-    # Replace all placeholders
-    for key, value in row_dict.items():
-        text = text.replace(f'{{{key}}}', str(value))
-    
-    return text
+    if context is None:
+        context = build_event_context(row_dict)
+    return get_compiled_template('event', 'text').render(context)
+
+# Row fields each computed context field is derived from. Placeholders not
+# listed here are copied straight from the row.
+RENDER_CONTEXT_DEPENDENCIES = {
+    'certificate': {
+        'OrgName': {'OrgName'},
+        'SupportEmail': {'SupportEmail'},
+        'Year': {'Year'},
+        'TeamOrSignerName': {'TeamOrSignerName'},
+        'Title': {'Title'},
+        'EventName': {'EventName', 'CourseTitle'},
+        'EventDate': {'EventDate', 'CompletionDate'},
+        'ThankYouMessage': {'EventName', 'CourseTitle', 'EventDate', 'CompletionDate', 'OrgName'},
+        'ThankYouMessagePlain': {'EventName', 'CourseTitle', 'EventDate', 'CompletionDate', 'OrgName'},
+        'AttachmentLine': {'CertificateFormat'},
+        'AttachmentLinePlain': {'CertificateFormat'},
+        'EventDetailsSection': {'EventName', 'CourseTitle', 'EventDate', 'CompletionDate', 'EventLocation'},
+        'EventDetailsBlock': {'EventName', 'CourseTitle', 'EventDate', 'CompletionDate', 'EventLocation'},
+        'ResourcesSection': {'ResourcesURL', 'ResourcesDescription'},
+        'ResourcesBlock': {'ResourcesURL', 'ResourcesDescription'},
+        'FeedbackSection': {'FeedbackURL'},
+        'FeedbackBlock': {'FeedbackURL'},
+        'FooterContact': {'OrgAddress', 'SupportEmail', 'OrgPhone'},
+        'FooterContactText': {'OrgAddress', 'SupportEmail', 'OrgPhone'}
+    },
+    'event': {
+        'HeroImageSection': {'HeroImageURL'},
+        'OutcomesSection': {'Outcome1', 'Outcome2'},
+        'OutcomesText': {'Outcome1', 'Outcome2'},
+        'SpeakersSection': {'Speaker1Name', 'Speaker1Title', 'Speaker2Name', 'Speaker2Title'},
+        'SpeakersText': {'Speaker1Name', 'Speaker1Title', 'Speaker2Name', 'Speaker2Title'},
+        'FooterContact': {'OrgAddress', 'SupportEmail'},
+        'FooterContactText': {'OrgAddress', 'SupportEmail'},
+        'UnsubscribeSection': {'UnsubscribeURL'},
+        'UnsubscribeText': {'UnsubscribeURL'}
+    }
+}
+
+def build_render_context(row_dict: Dict[str, str], template_key: str) -> Dict[str, str]:
+    """Build the shared HTML/text render context for the given template."""
+    if template_key == 'certificate':
+        return build_certificate_context(row_dict)
+    return build_event_context(row_dict)
 
 def render_email(row_dict: Dict[str, str], template_key: str) -> Tuple[str, str]:
     """
     Render email HTML and plain text for the given template.
+    Both variants share one render context built from row_dict.
     Returns (html_body, text_body).
     """
+    context = build_render_context(row_dict, template_key)
     if template_key == 'certificate':
-        return render_certificate_html(row_dict), render_certificate_text(row_dict)
+        return render_certificate_html(row_dict, context), render_certificate_text(row_dict, context)
     else:
-        return render_event_html(row_dict), render_event_text(row_dict)
+        return render_event_html(row_dict, context), render_event_text(row_dict, context)
+
+def find_varying_fields(rows_data: List[Dict[str, str]]) -> set:
+    """Return the row fields whose value (or presence) differs between rows."""
+    if not rows_data:
+        return set()
+    missing = object()
+    first = rows_data[0]
+    all_fields = set().union(*rows_data)
+    return {
+        field for field in all_fields
+        if any(row.get(field, missing) != first.get(field, missing) for row in rows_data)
+    }
+
+class CampaignRenderer:
+    """
+    Renders email bodies for one campaign with the recipient-invariant parts
+    of each template pre-rendered once.
+
+    Placeholders whose source fields are the same in every loaded row are
+    bound from the first row's render context. Only the varying ones (often
+    just {Name} and {Email}) are filled per recipient. A sample of rows is
+    checked against a full render_email() on creation. If any row differs,
+    the cache is disabled and every row gets a full render.
+    
+    rows_data may be only the first part of a streamed sheet. A later row
+    whose shared fields differ from the first row gets a full render.
+    """
+
+    def __init__(self, rows_data: List[Dict[str, str]], template_key: str, verify_sample: int = 5):
+        self.template_key = template_key
+        self.varying_fields = find_varying_fields(rows_data)
+        dependencies = RENDER_CONTEXT_DEPENDENCIES[template_key]
+        shared_fields = set().union(*rows_data) - self.varying_fields if rows_data else set()
+        self.shared_values = [(field, rows_data[0][field]) for field in sorted(shared_fields)]
+
+        base_context = build_render_context(rows_data[0], template_key) if rows_data else {}
+        self.templates = {}
+        self.varying_placeholders = set()
+        for part in ('html', 'text'):
+            compiled = get_compiled_template(template_key, part)
+            keep = {
+                name for name in compiled.placeholders
+                if dependencies.get(name, {name}) & self.varying_fields
+            }
+            self.varying_placeholders |= keep
+            self.templates[part] = compiled.bind(base_context, keep)
+
+        # Plain row fields can be read straight from the row; computed ones need a context
+        self.needs_context = any(name in dependencies for name in self.varying_placeholders)
+
+        self.enabled = bool(rows_data)
+        if self.enabled:
+            step = max(1, len(rows_data) // verify_sample)
+            sample = rows_data[::step][:verify_sample] + [rows_data[-1]]
+            self.enabled = self.verify(sample)
+
+    def verify(self, rows_data: List[Dict[str, str]]) -> bool:
+        """True if the cached path matches a full render byte for byte for every row."""
+        return all(self.render_email(row) == render_email(row, self.template_key) for row in rows_data)
+
+    def render_email(self, row_dict: Dict[str, str]) -> Tuple[str, str]:
+        """Render (html_body, text_body) for one recipient."""
+        if not self.enabled or any(row_dict.get(field) != value for field, value in self.shared_values):
+            return render_email(row_dict, self.template_key)
+        values = build_render_context(row_dict, self.template_key) if self.needs_context else row_dict
+        return self.templates['html'].render(values), self.templates['text'].render(values)
 
 def render_subject(row_dict: Dict[str, str], template_key: str, custom_subject: Optional[str] = None) -> str:
     """Render email subject with placeholders."""
@@ -1058,19 +2028,22 @@ def render_subject(row_dict: Dict[str, str], template_key: str, custom_subject:
                 subject = f"Thank You for Attending {event_name}"
     
     # Replace placeholders
-    for key, value in row_dict.items():
-        subject = subject.replace(f'{{{key}}}', str(value))
-    
-    return subject
+    return compile_template(subject).render(row_dict)
 
 # ============================================================================
 # GMAIL
 # ============================================================================
 
-def build_message(to: str, subject: str, html_body: str, text_body: str, 
-                 from_address: Optional[str] = None, attachment: Optional[BytesIO] = None,
-                 attachment_filename: str = "certificate.png") -> Dict:
-    """Build a MIME message for Gmail API with optional attachment."""
+# Messages at least this large are uploaded as raw RFC 822 bytes instead of base64 JSON
+GMAIL_UPLOAD_THRESHOLD = 256 * 1024
+# Uploads above this size use a resumable session so a dropped connection does not restart them
+GMAIL_RESUMABLE_THRESHOLD = 5 * 1024 * 1024
+
+def build_mime_message(to: str, subject: str, html_body: str, text_body: str, 
+                       from_address: Optional[str] = None, attachment: Optional[BytesIO] = None,
+                       attachment_filename: str = "certificate.png",
+                       attachment_mime_type: str = "image/png") -> MIMEMultipart:
+    """Build the MIME message with optional attachment, as sent by every transport."""
     message = MIMEMultipart('mixed') if attachment else MIMEMultipart('alternative')
     message['To'] = to
     message['Subject'] = subject
@@ -1086,10 +2059,14 @@ def build_message(to: str, subject: str, html_body: str, text_body: str,
         body_part.attach(part2)
         message.attach(body_part)
         
-        # Attach certificate image
-        img = MIMEImage(attachment.read(), name=attachment_filename)
-        img.add_header('Content-Disposition', 'attachment', filename=attachment_filename)
-        message.attach(img)
+        # Attach certificate (image or PDF)
+        maintype, subtype = attachment_mime_type.split('/', 1)
+        if maintype == 'image':
+            cert_part = MIMEImage(attachment.read(), _subtype=subtype, name=attachment_filename)
+        else:
+            cert_part = MIMEApplication(attachment.read(), _subtype=subtype, name=attachment_filename)
+        cert_part.add_header('Content-Disposition', 'attachment', filename=attachment_filename)
+        message.attach(cert_part)
     else:
         # No attachment, just text and HTML
         part1 = MIMEText(text_body, 'plain', 'utf-8')
@@ -1097,24 +2074,830 @@ def build_message(to: str, subject: str, html_body: str, text_body: str,
         message.attach(part1)
         message.attach(part2)
     
+    return message
+
+def build_message(to: str, subject: str, html_body: str, text_body: str, 
+                 from_address: Optional[str] = None, attachment: Optional[BytesIO] = None,
+                 attachment_filename: str = "certificate.png",
+                 attachment_mime_type: str = "image/png",
+                 upload_threshold: Optional[int] = GMAIL_UPLOAD_THRESHOLD) -> Dict:
+    """
+    Build a MIME message for Gmail API with optional attachment.
+    Returns {'raw': base64} or, at or above upload_threshold bytes,
+    {'mime_bytes': bytes} for a media upload.
+    """
+    mime_bytes = build_mime_message(to, subject, html_body, text_body, from_address, attachment,
+                                    attachment_filename, attachment_mime_type).as_bytes()
+    if upload_threshold is not None and len(mime_bytes) >= upload_threshold:
+        return {'mime_bytes': mime_bytes}
+    
     # Encode for Gmail API
-    raw_message = base64.urlsafe_b64encode(message.as_bytes()).decode('utf-8')
+    raw_message = base64.urlsafe_b64encode(mime_bytes).decode('utf-8')
     return {'raw': raw_message}
 
+def message_size(message: Dict) -> int:
+    """Bytes of message content sent to the API for a built message."""
+    if 'mime_bytes' in message:
+        return len(message['mime_bytes'])
+    return len(message['raw'])
+
+def gmail_send_request(gmail_service, message: Dict, user_id: str = 'me'):
+    """
+    Build the messages.send request for a built message.
+    Large messages go up as message/rfc822 media, with no base64 or JSON wrapping.
+    """
+    if 'mime_bytes' not in message:
+        return gmail_service.users().messages().send(userId=user_id, body=message)
+    mime_bytes = message['mime_bytes']
+    media = MediaIoBaseUpload(BytesIO(mime_bytes), mimetype='message/rfc822',
+                              resumable=len(mime_bytes) > GMAIL_RESUMABLE_THRESHOLD)
+    request = gmail_service.users().messages().send(userId=user_id, media_body=media)
+    if API_BASE_URL:
+        # googleapiclient moves upload URLs to the api_endpoint host but keeps https
+        base = urlparse(API_BASE_URL)
+        request.uri = urlparse(request.uri)._replace(scheme=base.scheme, netloc=base.netloc).geturl()
+    return request
+
 def send_gmail(gmail_service, message: Dict, user_id: str = 'me') -> Tuple[bool, Optional[str], Optional[str]]:
     """
     Send email via Gmail API.
     Returns (success, message_id, error).
     """
     try:
-        sent_message = gmail_service.users().messages().send(
-            userId=user_id,
-            body=message
-        ).execute()
+        sent_message = gmail_send_request(gmail_service, message, user_id).execute()
         return True, sent_message['id'], None
     except HttpError as error:
         return False, None, str(error)
 
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+RATE_LIMIT_REASONS = ('rateLimitExceeded', 'userRateLimitExceeded')
+
+class RetryPolicy:
+    """
+    Exponential backoff with full jitter for transient send errors.
+    Each email gets at most max_retries retries. All retries in a run
+    share a budget, so a long outage cannot stall the run forever.
+    """
+
+    def __init__(self, max_retries: int = 5, base_delay: float = 1.0,
+                 max_delay: float = 64.0, budget: int = 200):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.retries_used = 0
+        self._lock = threading.Lock()
+
+    def take_retry(self) -> bool:
+        """Reserve one retry from the run budget. False once it is spent."""
+        with self._lock:
+            if self.retries_used >= self.budget:
+                return False
+            self.retries_used += 1
+            return True
+
+    def backoff_delay(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Seconds to wait before retry number attempt (0-based)."""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header (seconds or HTTP date) into seconds."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+        return max(0.0, retry_at.timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+def classify_send_error(error: Exception) -> Tuple[bool, Optional[float]]:
+    """
+    Classify a send error as retryable or permanent.
+    Returns (retryable, retry_after_seconds).
+    """
+    if isinstance(error, HttpError):
+        status = error.resp.status
+        retry_after = parse_retry_after(error.resp.get('retry-after'))
+        if status in RETRYABLE_STATUS_CODES:
+            return True, retry_after
+        if status == 403 and any(reason in str(error) for reason in RATE_LIMIT_REASONS):
+            return True, retry_after
+        return False, None
+    
+    # SMTP replies: 4xx is temporary, 5xx is permanent
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500, None
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in error.recipients.values()), None
+    if isinstance(error, smtplib.SMTPException) and not isinstance(error, smtplib.SMTPServerDisconnected):
+        return False, None
+    
+    # Socket timeouts, dropped connections and other transport failures
+    if isinstance(error, (OSError, httplib2.HttpLib2Error)):
+        return True, None
+    
+    return False, None
+
+def send_gmail_with_retries(gmail_service, message: Dict, retry_policy: RetryPolicy,
+                            user_id: str = 'me',
+                            on_retry: Optional[Callable[[str], None]] = None,
+                            retries: int = 0
+                            ) -> Tuple[bool, Optional[str], Optional[str], int]:
+    """
+    Send email via Gmail API, retrying transient errors per retry_policy.
+    on_retry(error) is called before each retry.
+    Returns (success, message_id, error, retries).
+    """
+    return call_with_retries(
+        lambda: gmail_send_request(gmail_service, message, user_id).execute()['id'],
+        retry_policy, on_retry, retries)
+
+def call_with_retries(send_once: Callable[[], str], retry_policy: RetryPolicy,
+                      on_retry: Optional[Callable[[str], None]] = None,
+                      retries: int = 0
+                      ) -> Tuple[bool, Optional[str], Optional[str], int]:
+    """
+    Call send_once() (which returns a message ID or raises) until it succeeds,
+    fails permanently, or runs out of retries. retries is how many retries
+    the email has already used (e.g. in a batch), counted against max_retries.
+    Returns (success, message_id, error, retries).
+    """
+    while True:
+        try:
+            return True, send_once(), None, retries
+        except (HttpError, OSError, httplib2.HttpLib2Error) as error:
+            retryable, retry_after = classify_send_error(error)
+            if not retryable or retries >= retry_policy.max_retries or not retry_policy.take_retry():
+                return False, None, str(error), retries
+            if on_retry is not None:
+                on_retry(str(error))
+            time.sleep(retry_policy.backoff_delay(retries, retry_after))
+            retries += 1
+
+MIN_SEND_RATE = 0.05
+
+class AdaptiveRateLimiter:
+    """
+    Token-bucket rate limiter with AIMD rate adjustment.
+    
+    acquire() waits until the bucket has enough tokens. The rate grows
+    additively (about `increase` msg/s per second of successful sends) up
+    to max_rate. It is multiplied by decrease_factor when a send is
+    rejected for rate limiting, at most once per second. A rate that is
+    not positive is replaced by min_rate.
+    """
+
+    def __init__(self, rate: float, burst: int = 1, max_rate: Optional[float] = None,
+                 min_rate: float = MIN_SEND_RATE, increase: float = 0.05, decrease_factor: float = 0.5):
+        if min_rate <= 0:
+            min_rate = MIN_SEND_RATE
+        self.rate = rate if rate > 0 else min_rate
+        self.burst = max(1, burst)
+        self.max_rate = max(self.rate, max_rate or self.rate * 2)
+        self.min_rate = min(min_rate, self.rate)
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._last_decrease = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int = 1):
+        """Take tokens, sleeping until the bucket can cover them."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._last_refill) * self.rate)
+            self._last_refill = now
+            # Go into debt for the tokens; the debt is the wait
+            self._tokens -= tokens
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            time.sleep(wait)
+
+    def record_result(self, success: bool, error: Optional[str] = None):
+        """Adjust the rate from the outcome of one send."""
+        with self._lock:
+            if success:
+                self.rate = min(self.max_rate, self.rate + self.increase / self.rate)
+            elif error and is_rate_limit_error(error):
+                now = time.monotonic()
+                if now - self._last_decrease >= 1.0:
+                    self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+                    self._last_decrease = now
+
+def is_rate_limit_error(error: str) -> bool:
+    """True if a send error means the Gmail API asked us to slow down."""
+    return ('HttpError 429' in error or 'rateLimitExceeded' in error
+            or 'userRateLimitExceeded' in error or 'Too Many Requests' in error)
+
+GMAIL_MAX_BATCH_SIZE = 100
+
+def send_gmail_batch(gmail_service, messages: List[Dict], user_id: str = 'me',
+                     retry_policy: Optional[RetryPolicy] = None,
+                     on_retry: Optional[Callable[[str], None]] = None
+                     ) -> List[Tuple[bool, Optional[str], Optional[str], int]]:
+    """
+    Send several emails in one batched HTTP request (at most GMAIL_MAX_BATCH_SIZE).
+    Batches cannot carry media uploads, so large messages are sent individually.
+    With a retry_policy, a batch request that fails as a whole with a
+    transient error (429/5xx, timeout, dropped connection) is sent again
+    with backoff, and messages whose sub-response failed with a transient
+    error are re-sent individually with backoff. Retries in both phases
+    count towards each message's max_retries.
+    Returns one (success, message_id, error, retries) per message, in input order.
+    """
+    results: List[Tuple[bool, Optional[str], Optional[str], int]] = [
+        (False, None, 'No response in batch', 0)
+    ] * len(messages)
+    retry_indexes: List[Tuple[int, Optional[float]]] = []
+    batch_retries = 0
+
+    def on_response(request_id, response, exception):
+        index = int(request_id)
+        if exception is not None:
+            results[index] = (False, None, str(exception), batch_retries)
+            retryable, retry_after = classify_send_error(exception)
+            if retry_policy is not None and retryable:
+                retry_indexes.append((index, retry_after))
+        else:
+            results[index] = (True, response['id'], None, batch_retries)
+
+    upload_indexes = [index for index, message in enumerate(messages) if 'mime_bytes' in message]
+    batch_indexes = [index for index, message in enumerate(messages) if 'mime_bytes' not in message]
+
+    while batch_indexes:
+        if API_BASE_URL:
+            # The discovery batch URI ignores the api_endpoint override
+            batch = BatchHttpRequest(callback=on_response, batch_uri=API_BASE_URL.rstrip('/') + '/batch')
+        else:
+            batch = gmail_service.new_batch_http_request(callback=on_response)
+        for index in batch_indexes:
+            batch.add(gmail_service.users().messages().send(userId=user_id, body=messages[index]),
+                      request_id=str(index))
+        retry_indexes.clear()
+        try:
+            batch.execute()
+            break
+        except (HttpError, OSError, httplib2.HttpLib2Error) as error:
+            for index in batch_indexes:
+                results[index] = (False, None, str(error), batch_retries)
+            retryable, retry_after = classify_send_error(error)
+            if (retry_policy is None or not retryable or batch_retries >= retry_policy.max_retries
+                    or not retry_policy.take_retry()):
+                break
+            if on_retry is not None:
+                on_retry(str(error))
+            time.sleep(retry_policy.backoff_delay(batch_retries, retry_after))
+            batch_retries += 1
+
+    for index in upload_indexes:
+        if retry_policy is not None:
+            results[index] = send_gmail_with_retries(gmail_service, messages[index], retry_policy,
+                                                     user_id, on_retry)
+        else:
+            results[index] = send_gmail(gmail_service, messages[index], user_id) + (0,)
+
+    for index, retry_after in sorted(retry_indexes, key=lambda entry: entry[0]):
+        retries = results[index][3]
+        if retries >= retry_policy.max_retries:
+            continue
+        if not retry_policy.take_retry():
+            break
+        if on_retry is not None:
+            on_retry(results[index][2])
+        time.sleep(retry_policy.backoff_delay(retries, retry_after))
+        results[index] = send_gmail_with_retries(gmail_service, messages[index], retry_policy,
+                                                 user_id, on_retry, retries + 1)
+
+    return results
+
+class GmailSender:
+    """
+    Sends emails through the Gmail API from any number of threads.
+    
+    Each calling thread builds its own Gmail service from the shared credentials,
+    because the httplib2 transport behind a service is not thread-safe.
+    `workers` is how many threads the send stage should run.
+    """
+
+    def __init__(self, creds, workers: int = 1, send_fn: Optional[Callable[..., Tuple]] = None):
+        self.creds = creds
+        self.workers = workers
+        self.send_fn = send_fn or send_gmail
+        self._local = threading.local()
+
+    def _gmail_service(self):
+        service = getattr(self._local, 'gmail_service', None)
+        if service is None:
+            service = build_service('gmail', 'v1', self.creds)
+            self._local.gmail_service = service
+        return service
+
+    def send(self, message: Dict) -> Tuple:
+        """Send one message on the calling thread's service."""
+        return self.send_fn(self._gmail_service(), message)
+
+    def close(self):
+        pass
+
+# ============================================================================
+# ASYNC TRANSPORT
+# ============================================================================
+
+GMAIL_API_BASE_URL = 'https://gmail.googleapis.com'
+SHEETS_API_BASE_URL = 'https://sheets.googleapis.com'
+
+class AsyncGoogleTransport:
+    """
+    Talks to the Gmail messages.send and Sheets values.get REST endpoints
+    with aiohttp, without going through googleapiclient.
+    
+    One keep-alive connection pool is shared by all requests, and a semaphore
+    bounds how many are in flight. API errors are raised as HttpError, so
+    results and retry decisions match the blocking send path. The base URLs
+    default to API_BASE_URL when set, otherwise to Google; creds may be None
+    (or anonymous) for a local server.
+    """
+
+    def __init__(self, creds, max_concurrency: int = 10,
+                 gmail_base_url: Optional[str] = None,
+                 sheets_base_url: Optional[str] = None,
+                 timeout: float = 60.0):
+        if not AIOHTTP_AVAILABLE:
+            raise RuntimeError("aiohttp is not installed. Install it with: pip install aiohttp")
+        self.creds = creds
+        self.max_concurrency = max_concurrency
+        self.gmail_base_url = (gmail_base_url or API_BASE_URL or GMAIL_API_BASE_URL).rstrip('/')
+        self.sheets_base_url = (sheets_base_url or API_BASE_URL or SHEETS_API_BASE_URL).rstrip('/')
+        self.timeout = timeout
+        self._session = None
+        self._semaphore = None
+        self._refresh_lock = None
+
+    async def open(self):
+        """Create the session; must be called on the event loop that will use it."""
+        connector = aiohttp.TCPConnector(limit=self.max_concurrency)
+        self._session = aiohttp.ClientSession(connector=connector,
+                                              timeout=aiohttp.ClientTimeout(total=self.timeout))
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._refresh_lock = asyncio.Lock()
+
+    async def close(self):
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def _auth_headers(self) -> Dict[str, str]:
+        if self.creds is None:
+            return {}
+        if not self.creds.valid:
+            async with self._refresh_lock:
+                if not self.creds.valid:
+                    # google-auth refresh is blocking; keep it off the event loop
+                    await asyncio.to_thread(self.creds.refresh, Request())
+        if self.creds.token is None:
+            return {}
+        return {'Authorization': f'Bearer {self.creds.token}'}
+
+    async def _request(self, method: str, url: str, **kwargs) -> Dict:
+        async with self._semaphore:
+            headers = await self._auth_headers()
+            headers.update(kwargs.pop('headers', {}))
+            async with self._session.request(method, url, headers=headers, **kwargs) as response:
+                content = await response.read()
+                if response.status >= 400:
+                    info = {key.lower(): value for key, value in response.headers.items()}
+                    info['status'] = response.status
+                    raise HttpError(httplib2.Response(info), content, uri=url)
+                return json.loads(content) if content else {}
+
+    async def _send_once(self, message: Dict, user_id: str) -> Dict:
+        user = quote(user_id, safe='')
+        if 'mime_bytes' in message:
+            url = f"{self.gmail_base_url}/upload/gmail/v1/users/{user}/messages/send?uploadType=media"
+            return await self._request('POST', url, data=message['mime_bytes'],
+                                       headers={'Content-Type': 'message/rfc822'})
+        url = f"{self.gmail_base_url}/gmail/v1/users/{user}/messages/send"
+        return await self._request('POST', url, json=message)
+
+    async def send_message(self, message: Dict, user_id: str = 'me') -> Tuple[bool, Optional[str], Optional[str]]:
+        """
+        Send email via the Gmail REST API.
+        Returns (success, message_id, error).
+        """
+        try:
+            sent_message = await self._send_once(message, user_id)
+            return True, sent_message['id'], None
+        except (HttpError, aiohttp.ClientError, asyncio.TimeoutError) as error:
+            return False, None, str(error) or type(error).__name__
+
+    async def send_message_with_retries(self, message: Dict, retry_policy: RetryPolicy,
+                                        user_id: str = 'me',
+                                        on_retry: Optional[Callable[[str], None]] = None
+                                        ) -> Tuple[bool, Optional[str], Optional[str], int]:
+        """
+        Async counterpart of send_gmail_with_retries.
+        Returns (success, message_id, error, retries).
+        """
+        retries = 0
+        while True:
+            try:
+                sent_message = await self._send_once(message, user_id)
+                return True, sent_message['id'], None, retries
+            except (HttpError, aiohttp.ClientError, asyncio.TimeoutError) as error:
+                if isinstance(error, HttpError):
+                    retryable, retry_after = classify_send_error(error)
+                else:
+                    retryable, retry_after = True, None
+                error_text = str(error) or type(error).__name__
+                if not retryable or retries >= retry_policy.max_retries or not retry_policy.take_retry():
+                    return False, None, error_text, retries
+                if on_retry is not None:
+                    on_retry(error_text)
+                await asyncio.sleep(retry_policy.backoff_delay(retries, retry_after))
+                retries += 1
+
+    async def get_values(self, spreadsheet_id: str, range_name: str) -> List[List[str]]:
+        """Fetch a range with the Sheets values.get endpoint. Raises HttpError on failure."""
+        url = (f"{self.sheets_base_url}/v4/spreadsheets/{quote(spreadsheet_id, safe='')}"
+               f"/values/{quote(range_name, safe='')}")
+        result = await self._request('GET', url)
+        return result.get('values', [])
+
+class AsyncSender:
+    """
+    Sends emails through an AsyncGoogleTransport on a background event loop.
+    
+    send() may be called from many threads; each call waits for its own
+    request. All requests share one connection pool instead of a thread
+    and Gmail service per worker.
+    """
+
+    def __init__(self, creds, max_concurrency: int,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 on_retry: Optional[Callable[[str], None]] = None, **transport_kwargs):
+        self.workers = max_concurrency
+        self.retry_policy = retry_policy
+        self.on_retry = on_retry
+        self.transport = AsyncGoogleTransport(creds, max_concurrency, **transport_kwargs)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name='gmail-async', daemon=True)
+        self._thread.start()
+        self._run(self.transport.open())
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def send(self, message: Dict) -> Tuple:
+        """Send one message on the event loop and wait for the result."""
+        if self.retry_policy is not None:
+            return self._run(self.transport.send_message_with_retries(message, self.retry_policy,
+                                                                      on_retry=self.on_retry))
+        return self._run(self.transport.send_message(message))
+
+    def close(self):
+        """Close the connection pool and stop the event loop."""
+        self._run(self.transport.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+# ============================================================================
+# SMTP
+# ============================================================================
+
+SMTP_SECURITY_MODES = ('starttls', 'ssl', 'none')
+
+class SmtpConnectionPool:
+    """
+    A fixed number of authenticated SMTP connections kept open for the run.
+    
+    Messages are serialized once by prepare() into an envelope
+    (from_addr, to_addrs, data, message_id). Connections are opened on
+    first use and handed out one sender at a time. A connection the server
+    has dropped (e.g. after an idle timeout) is reopened once and the
+    message is sent again on the new one.
+    """
+
+    def __init__(self, host: str, port: int = 587, username: Optional[str] = None,
+                 password: Optional[str] = None, security: str = 'starttls',
+                 pool_size: int = 3, from_address: Optional[str] = None, timeout: float = 60.0):
+        if security not in SMTP_SECURITY_MODES:
+            raise ValueError(f"Unknown SMTP security mode: {security}")
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.security = security
+        self.pool_size = pool_size
+        self.from_address = from_address or username
+        self.timeout = timeout
+        self.connects = 0
+        self._connections = queue.LifoQueue()
+        for _ in range(pool_size):
+            self._connections.put(None)
+
+    def _connect(self) -> smtplib.SMTP:
+        if self.security == 'ssl':
+            connection = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout,
+                                          context=ssl.create_default_context())
+        else:
+            connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            if self.security == 'starttls':
+                connection.starttls(context=ssl.create_default_context())
+        if self.username:
+            connection.login(self.username, self.password or '')
+        self.connects += 1
+        return connection
+
+    def prepare(self, message: MIMEMultipart) -> Tuple[str, List[str], bytes, str]:
+        """Fill in Message-ID and From, and serialize the message for sending."""
+        if message['Message-ID'] is None:
+            message['Message-ID'] = make_msgid()
+        if message['From'] is None and self.from_address:
+            message['From'] = self.from_address
+        from_addrs = getaddresses(message.get_all('From', []))
+        from_addr = from_addrs[0][1] if from_addrs else ''
+        to_addrs = [address for _, address in getaddresses(message.get_all('To', []))]
+        return from_addr, to_addrs, message.as_bytes(), message['Message-ID']
+
+    def send_message(self, envelope: Tuple[str, List[str], bytes, str]) -> str:
+        """Send one prepared message and return its Message-ID. Raises on failure."""
+        from_addr, to_addrs, data, message_id = envelope
+        connection = self._connections.get()
+        try:
+            for attempt in range(2):
+                if connection is None:
+                    connection = self._connect()
+                try:
+                    connection.sendmail(from_addr, to_addrs, data)
+                    return message_id
+                except (smtplib.SMTPServerDisconnected, ConnectionError):
+                    self._discard(connection)
+                    connection = None
+                    if attempt:
+                        raise
+        finally:
+            self._connections.put(connection)
+
+    def send(self, envelope: Tuple[str, List[str], bytes, str]) -> Tuple[bool, Optional[str], Optional[str]]:
+        """
+        Send a prepared email via SMTP.
+        Returns (success, message_id, error).
+        """
+        try:
+            return True, self.send_message(envelope), None
+        except (smtplib.SMTPException, OSError) as error:
+            return False, None, str(error) or type(error).__name__
+
+    @staticmethod
+    def _discard(connection: Optional[smtplib.SMTP]):
+        if connection is None:
+            return
+        try:
+            connection.close()
+        except OSError:
+            pass
+
+    def close(self):
+        """QUIT and close every open connection."""
+        for _ in range(self.pool_size):
+            connection = self._connections.get()
+            if connection is None:
+                continue
+            try:
+                connection.quit()
+            except (smtplib.SMTPException, OSError):
+                self._discard(connection)
+
+class SmtpSender:
+    """
+    Sends prepared messages through an SmtpConnectionPool.
+    The send stage runs one worker thread per pooled connection.
+    """
+
+    def __init__(self, pool: SmtpConnectionPool,
+                 retry_policy: Optional[RetryPolicy] = None,
+                 on_retry: Optional[Callable[[str], None]] = None):
+        self.pool = pool
+        self.workers = pool.pool_size
+        self.retry_policy = retry_policy
+        self.on_retry = on_retry
+
+    def send(self, message: Tuple[str, List[str], bytes, str]) -> Tuple:
+        """Send one prepared message on a pooled connection."""
+        if self.retry_policy is None:
+            return self.pool.send(message)
+        return call_with_retries(lambda: self.pool.send_message(message), self.retry_policy, self.on_retry)
+
+    def close(self):
+        """Close the pooled connections."""
+        self.pool.close()
+
+# ============================================================================
+# PIPELINE
+# ============================================================================
+
+_PIPELINE_END = object()
+
+class PipelineStage:
+    """
+    One stage of a Pipeline: process(item) -> item, run by `workers` threads.
+    With batch_size > 1, process receives and returns lists of up to
+    batch_size items.
+    Collects item count, busy time and input queue depth.
+    """
+
+    def __init__(self, name: str, process: Callable, workers: int = 1, batch_size: int = 1):
+        self.name = name
+        self.process = process
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self.items = 0
+        self.busy_seconds = 0.0
+        self.max_depth = 0
+        self._depth_total = 0
+        self._depth_samples = 0
+        self._lock = threading.Lock()
+
+    def record(self, items: int, seconds: float):
+        with self._lock:
+            self.items += items
+            self.busy_seconds += seconds
+
+    def record_depth(self, depth: int):
+        with self._lock:
+            self.max_depth = max(self.max_depth, depth)
+            self._depth_total += depth
+            self._depth_samples += 1
+
+    @property
+    def avg_depth(self) -> float:
+        return self._depth_total / self._depth_samples if self._depth_samples else 0.0
+
+class Pipeline:
+    """
+    Runs items through stages connected by bounded queues.
+    
+    Each stage has its own worker threads. A full queue blocks the stage
+    feeding it, so the slowest stage sets the pace and the others work at
+    most queue_size items ahead of it. Stages with several workers may
+    finish items out of order. The sink (e.g. logging) runs on the
+    calling thread and sees items in input order.
+    
+    An exception in a stage, or Ctrl+C, stops feeding new items and stops
+    stages from processing the ones still queued. Items that already made
+    it through every stage (e.g. emails that were sent) are still handed
+    to the sink; the rest are dropped. run() then re-raises the exception.
+    """
+
+    def __init__(self, stages: List[PipelineStage], queue_size: int = 64):
+        self.stages = stages
+        self.queue_size = queue_size
+        self.sink_stage = None
+        self.elapsed_seconds = 0.0
+        self._failure = None
+
+    def _worker(self, stage: PipelineStage, inbox: queue.Queue, outbox: queue.Queue,
+                next_stage: Optional[PipelineStage], remaining: List[int], lock: threading.Lock):
+        while True:
+            entry = inbox.get()
+            if entry is _PIPELINE_END:
+                inbox.put(_PIPELINE_END)
+                break
+            batch = [entry]
+            while len(batch) < stage.batch_size:
+                entry = inbox.get()
+                if entry is _PIPELINE_END:
+                    inbox.put(_PIPELINE_END)
+                    break
+                batch.append(entry)
+            
+            # Entries are (seq, item, done); done turns False once a stage skips the item
+            if self._failure is None and all(done for _, _, done in batch):
+                started = time.perf_counter()
+                try:
+                    if stage.batch_size > 1:
+                        items = stage.process([item for _, item, _ in batch])
+                    else:
+                        items = [stage.process(batch[0][1])]
+                    batch = [(seq, item, True) for (seq, _, _), item in zip(batch, items)]
+                except Exception as e:
+                    self._failure = self._failure or e
+                    batch = [(seq, item, False) for seq, item, _ in batch]
+                stage.record(len(batch), time.perf_counter() - started)
+            else:
+                batch = [(seq, item, False) for seq, item, _ in batch]
+            
+            for entry in batch:
+                outbox.put(entry)
+                if next_stage is not None:
+                    next_stage.record_depth(outbox.qsize())
+        
+        # The last worker out passes end-of-stream downstream
+        with lock:
+            remaining[0] -= 1
+            last = remaining[0] == 0
+        if last:
+            outbox.put(_PIPELINE_END)
+
+    def run(self, items: Iterable, sink: Callable, sink_name: str = 'log'):
+        """Push items through every stage and hand each result to sink(item) in order."""
+        started = time.perf_counter()
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)]
+        threads = []
+        for index, stage in enumerate(self.stages):
+            next_stage = self.stages[index + 1] if index + 1 < len(self.stages) else None
+            remaining = [stage.workers]
+            lock = threading.Lock()
+            for worker in range(stage.workers):
+                thread = threading.Thread(target=self._worker, name=f"{stage.name}-{worker}", daemon=True,
+                                          args=(stage, queues[index], queues[index + 1],
+                                                next_stage, remaining, lock))
+                thread.start()
+                threads.append(thread)
+        
+        def feed():
+            try:
+                for seq, item in enumerate(items):
+                    if self._failure is not None:
+                        break
+                    queues[0].put((seq, item, True))
+                    self.stages[0].record_depth(queues[0].qsize())
+            except Exception as e:
+                self._failure = self._failure or e
+            finally:
+                queues[0].put(_PIPELINE_END)
+        
+        feeder = threading.Thread(target=feed, name='pipeline-feed', daemon=True)
+        feeder.start()
+        
+        # Sink: restore input order, then hand items over one by one
+        self.sink_stage = PipelineStage(sink_name, sink)
+        waiting = {}
+        next_seq = [0]
+        interrupted = None
+        while True:
+            try:
+                self._drain(queues[-1], sink, waiting, next_seq)
+                break
+            except KeyboardInterrupt as interrupt:
+                # Stop feeding and processing, but still log what is already done
+                interrupted = interrupted or interrupt
+                self._failure = self._failure or interrupt
+        
+        feeder.join()
+        for thread in threads:
+            thread.join()
+        self.elapsed_seconds = time.perf_counter() - started
+        if interrupted is not None:
+            raise interrupted
+        if self._failure is not None:
+            raise self._failure
+
+    def _drain(self, outbox: queue.Queue, sink: Callable, waiting: Dict, next_seq: List[int]):
+        """Pass finished items from the last queue to the sink in input order, until end-of-stream."""
+        while True:
+            entry = outbox.get()
+            if entry is _PIPELINE_END:
+                return
+            self.sink_stage.record_depth(outbox.qsize())
+            waiting[entry[0]] = entry
+            while next_seq[0] in waiting:
+                _, item, done = waiting.pop(next_seq[0])
+                next_seq[0] += 1
+                if done:
+                    sink_started = time.perf_counter()
+                    try:
+                        sink(item)
+                    except Exception as e:
+                        self._failure = self._failure or e
+                    self.sink_stage.record(1, time.perf_counter() - sink_started)
+
+    def print_stats(self):
+        """Print per-stage throughput, utilization and queue depth."""
+        elapsed = max(self.elapsed_seconds, 1e-9)
+        stages = self.stages + ([self.sink_stage] if self.sink_stage else [])
+        print(f"{'Stage':<12}{'Workers':>8}{'Items':>8}{'Items/s':>10}{'Busy':>7}{'AvgQ':>7}{'MaxQ':>6}")
+        for stage in stages:
+            busy = stage.busy_seconds / (elapsed * stage.workers) * 100
+            print(f"{stage.name:<12}{stage.workers:>8}{stage.items:>8}{stage.items / elapsed:>10.1f}"
+                  f"{busy:>6.0f}%{stage.avg_depth:>7.1f}{stage.max_depth:>6}")
+
 # ============================================================================
 # LOGGING
 # ============================================================================
@@ -1123,34 +2906,85 @@ def init_log(log_path: str):
     """Initialize CSV log file with headers."""
     with open(log_path, 'w', newline='', encoding='utf-8') as f:
         writer = csv.writer(f)
-        writer.writerow(['Email', 'Subject', 'Status', 'MessageId', 'Error', 'Timestamp', 'TemplateUsed'])
+        writer.writerow(['Email', 'Subject', 'Status', 'MessageId', 'Error', 'Timestamp', 'TemplateUsed', 'Retries', 'Bytes'])
 
 def log_result(log_path: str, email: str, subject: str, status: str, 
-               message_id: Optional[str], error: Optional[str], template_key: str):
+               message_id: Optional[str], error: Optional[str], template_key: str,
+               retries: int = 0, message_bytes: Optional[int] = None):
     """Append a result to the CSV log."""
     timestamp = datetime.now().isoformat()
     with open(log_path, 'a', newline='', encoding='utf-8') as f:
         writer = csv.writer(f)
-        writer.writerow([email, subject, status, message_id or '', error or '', timestamp, template_key])
+        writer.writerow([email, subject, status, message_id or '', error or '', timestamp, template_key,
+                         retries, '' if message_bytes is None else message_bytes])
+
+def progress_label(idx: int, total: Optional[int]) -> str:
+    """Progress prefix like [3/120], or [3] while the row count is still unknown."""
+    return f"[{idx}/{total}]" if total is not None else f"[{idx}]"
+
+def report_send_result(idx: int, total: Optional[int], email: str, subject: str,
+                       result: Tuple[bool, Optional[str], Optional[str]],
+                       log_path: str, template_key: str, counts: Dict[str, int],
+                       limiter: Optional[AdaptiveRateLimiter] = None,
+                       message_bytes: Optional[int] = None):
+    """
+    Print, log and count the outcome of one send as SENT or FAILED.
+    result is (success, message_id, error) with an optional retry count.
+    The outcome is also fed to the rate limiter, whose current rate is shown.
+    message_bytes is the request content size of the message, if known.
+    """
+    success, message_id, error = result[:3]
+    retries = result[3] if len(result) > 3 else 0
+    rate_note = ''
+    if limiter is not None:
+        limiter.record_result(success, error)
+        rate_note = f" [{limiter.rate:.2f} msg/s]"
+    retry_note = f" (after {retries} retries)" if retries else ''
+    size_note = f" ({message_bytes / 1024:.1f} KB)" if message_bytes is not None else ''
+    if success:
+        print(f"{progress_label(idx, total)} SENT {email}: {subject[:50]}...{size_note}{retry_note}{rate_note}")
+        log_result(log_path, email, subject, 'SENT', message_id, None, template_key, retries, message_bytes)
+        counts['sent'] += 1
+        if message_bytes is not None:
+            counts['bytes_sent'] += message_bytes
+    else:
+        print(f"{progress_label(idx, total)} FAILED {email}: {error}{retry_note}{rate_note}")
+        log_result(log_path, email, subject, 'FAILED', None, error, template_key, retries, message_bytes)
+        counts['failed'] += 1
+
+def report_skipped_row(idx: int, total: Optional[int], email: str, error_reason: str,
+                       log_path: str, template_key: str, counts: Dict[str, int]):
+    """Print, log and count a row that failed validation."""
+    print(f"{progress_label(idx, total)} SKIPPED {email}: {error_reason}")
+    log_result(log_path, email, '', 'SKIPPED', None, error_reason, template_key)
+    counts['skipped'] += 1
 
 # ============================================================================
 # INTERACTIVE PROMPTS
 # ============================================================================
 
-def prompt_sheet_info() -> str:
-    """Prompt for Google Sheet URL or ID."""
-    print("=== Google Sheet Configuration ===")
+def prompt_sheet_info() -> Dict:
+    """
+    Prompt for Google Sheet URL or ID and how many rows to fetch per request,
+    or for a local recipient file (returned as 'path').
+    """
+    print("=== Recipient Source ===")
     print("You can paste:")
     print("  • Full Google Sheets URL")
     print("  • Just the Sheet ID")
+    print("  • Path to a local .csv, .tsv, .jsonl or .xlsx file")
     print()
     
-    user_input = input("Enter Google Sheet URL or ID: ").strip()
+    user_input = input("Enter Google Sheet URL/ID or file path: ").strip()
     
     if not user_input:
         print("ERROR: Sheet URL/ID cannot be empty")
         sys.exit(1)
     
+    if is_row_source_path(user_input) or os.path.isfile(user_input):
+        print()
+        return {'path': user_input}
+    
     # Extract ID from URL if needed
     sheet_id = extract_sheet_id(user_input)
     
@@ -1158,8 +2992,16 @@ def prompt_sheet_info() -> str:
     if sheet_id != user_input:
         print(f"✓ Extracted Sheet ID: {sheet_id}")
     
+    page_input = input(f"Rows per fetch page (default: {SHEET_PAGE_SIZE}): ").strip()
+    try:
+        page_size = max(1, int(page_input)) if page_input else SHEET_PAGE_SIZE
+    except ValueError:
+        page_size = SHEET_PAGE_SIZE
+    
+    refresh = input("Re-download the sheet even if the cached copy is current? (y/N): ").strip().lower() == 'y'
+    
     print()
-    return sheet_id
+    return {'path': None, 'sheet_id': sheet_id, 'page_size': page_size, 'refresh': refresh}
 
 def prompt_template_selection() -> str:
     """Prompt for template selection."""
@@ -1293,13 +3135,24 @@ def prompt_certificate_config() -> Dict:
     detected_line_y = None
     coverage = 0.0
 
+    # Hash once; the analysis is reused below to record font metrics
+    try:
+        content_hash = template_content_hash(template_path)
+    except OSError:
+        content_hash = None
+    analysis = None
+
     if auto_position:
-        detected_line_y, coverage = detect_horizontal_guideline(template_path)
+        if content_hash is not None:
+            analysis = analyze_template(template_path, content_hash)
+            detected_line_y, coverage = analysis['detected_line_y'], analysis['coverage']
         if detected_line_y is not None:
             print(f"✓ Detected horizontal guideline at Y={detected_line_y} (coverage {coverage:.0%})")
         else:
             print("⚠ Could not detect a clear horizontal guideline. Falling back to manual input.")
             auto_position = False
+    elif content_hash is not None:
+        analysis = load_template_analysis(template_path, content_hash)  # no pixel scan
 
     text_position = None
 
@@ -1324,11 +3177,65 @@ def prompt_certificate_config() -> Dict:
     # Get font size
     font_size_input = input("Font size (default: 80): ").strip()
     font_size = int(font_size_input) if font_size_input else 80
+    if analysis is not None:
+        record_font_metrics(template_path, analysis, font_size)
     
     # Get font color
     print()
     font_color = input("Font color in hex (default: #000000 for black): ").strip() or "#000000"
     
+    # Output encoding
+    print()
+    print("Certificate output format:")
+    format_keys = list(CERTIFICATE_OUTPUT_FORMATS)
+    for i, fmt in enumerate(format_keys, 1):
+        print(f"  {i}. {CERTIFICATE_OUTPUT_FORMATS[fmt]['label']}")
+    format_input = input("Choose format (default: 1): ").strip()
+    try:
+        output_format = format_keys[int(format_input) - 1] if format_input else 'png'
+    except (ValueError, IndexError):
+        print("⚠ Invalid choice, using PNG.")
+        output_format = 'png'
+
+    quality = 85
+    png_compress_level = 6
+    if output_format in ('png', 'png-palette'):
+        level_input = input("PNG compression level 0-9 (default: 6, lower = faster/larger): ").strip()
+        png_compress_level = min(9, max(0, int(level_input))) if level_input else 6
+    elif output_format in ('jpeg', 'webp'):
+        quality_input = input("Quality 1-100 (default: 85): ").strip()
+        quality = min(100, max(1, int(quality_input))) if quality_input else 85
+
+    compare_input = input("Compare encode time and size of all formats on a sample? (y/N): ").strip().lower()
+    if compare_input == 'y':
+        sample_config = {
+            'template_path': template_path, 'text_position': text_position, 'font_size': font_size,
+            'font_color': font_color, 'auto_position': auto_position,
+            'detected_line_y': detected_line_y, 'vertical_offset': vertical_offset,
+            'quality': quality, 'png_compress_level': png_compress_level
+        }
+        try:
+            print(f"  {'Format':<34}{'Encode':>10}{'Size':>12}")
+            for fmt, seconds, size in benchmark_certificate_formats(sample_config):
+                print(f"  {CERTIFICATE_OUTPUT_FORMATS[fmt]['label']:<34}{seconds * 1000:>8.0f}ms{size / 1024:>10.0f}KB")
+        except Exception as e:
+            print(f"⚠ Could not benchmark formats: {e}")
+
+    # Disk cache for reruns
+    print()
+    cache_input = input("Cache rendered certificates on disk for reruns? (Y/n): ").strip().lower()
+    cache_dir = None
+    cache_max_mb = 500
+    if cache_input != 'n':
+        cache_dir = input(f"Cache directory (default: {CERTIFICATE_CACHE_DIR}): ").strip() or CERTIFICATE_CACHE_DIR
+        cache_size_input = input("Cache size limit in MB (default: 500): ").strip()
+        cache_max_mb = float(cache_size_input) if cache_size_input else 500
+
+    # Parallel rendering
+    print()
+    workers_input = input("Certificate render worker processes (default: 1 = render in main process): ").strip()
+    render_workers = max(1, int(workers_input)) if workers_input else 1
+    
     print()
     print("✓ Configuration:")
     print(f"  Template: {template_path}")
@@ -1342,6 +3249,11 @@ def prompt_certificate_config() -> Dict:
         print(f"  Vertical Offset: {vertical_offset}")
     print(f"  Font Size: {font_size}")
     print(f"  Color: {font_color}")
+    print(f"  Output: {CERTIFICATE_OUTPUT_FORMATS[output_format]['label']}")
+    if cache_dir:
+        print(f"  Cache: {cache_dir} (limit {cache_max_mb:g} MB)")
+    if render_workers > 1:
+        print(f"  Render Workers: {render_workers}")
     print()
     
     return {
@@ -1351,7 +3263,54 @@ def prompt_certificate_config() -> Dict:
         'font_color': font_color,
         'auto_position': auto_position,
         'detected_line_y': detected_line_y,
-        'vertical_offset': vertical_offset
+        'vertical_offset': vertical_offset,
+        'render_workers': render_workers,
+        'output_format': output_format,
+        'quality': quality,
+        'png_compress_level': png_compress_level,
+        'cache_dir': cache_dir,
+        'cache_max_mb': cache_max_mb
+    }
+
+def prompt_export_mode() -> Optional[str]:
+    """Prompt for export-only mode. Returns a directory/.zip path, or None to send emails."""
+    print("=== Output Mode ===")
+    print("1. Send certificates by email")
+    print("2. Export certificates only (folder or ZIP, no emails)")
+    choice = input("Choose mode (default: 1): ").strip()
+    
+    if choice != '2':
+        print()
+        return None
+    
+    export_path = input("Export to folder or .zip file (default: certificates.zip): ").strip() or "certificates.zip"
+    print()
+    return export_path
+
+def prompt_smtp_config() -> Dict:
+    """Prompt for SMTP relay settings."""
+    host = input("SMTP host (default: localhost): ").strip() or "localhost"
+    
+    print("SMTP security: 1. STARTTLS (default)  2. SSL/TLS  3. None")
+    security = {'2': 'ssl', '3': 'none'}.get(input("Choose security (default: 1): ").strip(), 'starttls')
+    
+    default_port = {'starttls': 587, 'ssl': 465, 'none': 25}[security]
+    port_input = input(f"SMTP port (default: {default_port}): ").strip()
+    port = int(port_input) if port_input else default_port
+    
+    username = input("SMTP username (blank for no login): ").strip() or None
+    password = getpass.getpass("SMTP password: ") if username else None
+    
+    pool_input = input("SMTP connections to keep open (default: 3): ").strip()
+    pool_size = max(1, int(pool_input)) if pool_input else 3
+    
+    return {
+        'host': host,
+        'port': port,
+        'security': security,
+        'username': username,
+        'password': password,
+        'pool_size': pool_size
     }
 
 def prompt_options() -> Dict:
@@ -1361,8 +3320,58 @@ def prompt_options() -> Dict:
     dry_run_input = input("Dry-run mode? (Y/n): ").strip().lower()
     dry_run = dry_run_input != 'n'
     
-    throttle_input = input("Throttle seconds between sends (default: 0.8): ").strip()
-    throttle = float(throttle_input) if throttle_input else 0.8
+    rate_input = input("Target send rate in emails/second (default: 1.25; adapts to API limits): ").strip()
+    send_rate = float(rate_input) if rate_input else 1.25
+    if send_rate <= 0:
+        print(f"Send rate must be positive - using {MIN_SEND_RATE}")
+        send_rate = MIN_SEND_RATE
+    
+    burst_input = input("Burst size (default: 1): ").strip()
+    burst = max(1, int(burst_input)) if burst_input else 1
+    
+    retries_input = input("Max retries per email for temporary errors (default: 5): ").strip()
+    max_retries = max(0, int(retries_input)) if retries_input else 5
+    
+    budget_input = input("Total retry budget for the run (default: 200): ").strip()
+    retry_budget = max(0, int(budget_input)) if budget_input else 200
+    
+    print("Send transport:")
+    print("  1. Gmail API (default)")
+    if AIOHTTP_AVAILABLE:
+        print("  2. Gmail API over async HTTP (aiohttp, many requests over one connection pool)")
+    print("  3. SMTP relay")
+    transport_choice = input("Choose transport (default: 1): ").strip()
+    send_transport = 'api'
+    if transport_choice == '2' and AIOHTTP_AVAILABLE:
+        send_transport = 'async'
+    elif transport_choice == '3':
+        send_transport = 'smtp'
+    
+    batch_size = 1
+    send_workers = 1
+    async_concurrency = 10
+    smtp_config = None
+    if send_transport == 'api':
+        batch_input = input(f"Emails per batched Gmail request (default: 1 = no batching, max {GMAIL_MAX_BATCH_SIZE}): ").strip()
+        batch_size = min(GMAIL_MAX_BATCH_SIZE, max(1, int(batch_input))) if batch_input else 1
+        if batch_size == 1:
+            workers_input = input("Concurrent send threads (default: 1): ").strip()
+            send_workers = max(1, int(workers_input)) if workers_input else 1
+    elif send_transport == 'async':
+        concurrency_input = input("Max concurrent requests (default: 10): ").strip()
+        async_concurrency = max(1, int(concurrency_input)) if concurrency_input else 10
+    else:
+        smtp_config = prompt_smtp_config()
+    
+    render_input = input("Worker threads for the render stage (default: 1): ").strip()
+    render_workers = max(1, int(render_input)) if render_input else 1
+    build_input = input("Worker threads for the message-build stage (default: 1): ").strip()
+    build_workers = max(1, int(build_input)) if build_input else 1
+    
+    upload_threshold_kb = GMAIL_UPLOAD_THRESHOLD // 1024
+    if send_transport != 'smtp':
+        upload_input = input(f"Upload messages of at least N KB as raw MIME (default: {upload_threshold_kb}): ").strip()
+        upload_threshold_kb = max(0, int(upload_input)) if upload_input else upload_threshold_kb
     
     from_address = input("From address override (blank for 'me'): ").strip() or None
     
@@ -1376,7 +3385,18 @@ def prompt_options() -> Dict:
     
     return {
         'dry_run': dry_run,
-        'throttle': throttle,
+        'send_rate': send_rate,
+        'burst': burst,
+        'max_retries': max_retries,
+        'retry_budget': retry_budget,
+        'batch_size': batch_size,
+        'send_workers': send_workers,
+        'send_transport': send_transport,
+        'async_concurrency': async_concurrency,
+        'smtp': smtp_config,
+        'upload_threshold_kb': upload_threshold_kb,
+        'render_workers': render_workers,
+        'build_workers': build_workers,
         'from_address': from_address,
         'filter_email': filter_email,
         'log_path': log_path,
@@ -1419,6 +3439,32 @@ def confirm_send() -> bool:
 # MAIN WORKFLOW
 # ============================================================================
 
+PIPELINE_QUEUE_SIZE = 64
+
+class SendJob:
+    """One sheet row as it moves through the send pipeline."""
+    
+    __slots__ = ('idx', 'row', 'email', 'skip_reason', 'subject', 'html_body', 'text_body',
+                 'attachment', 'attachment_filename', 'encode_seconds', 'cache_hit', 'warning',
+                 'message', 'message_bytes', 'result')
+    
+    def __init__(self, idx: int, row: Dict[str, str]):
+        self.idx = idx
+        self.row = row
+        self.email = ''
+        self.skip_reason = None
+        self.subject = ''
+        self.html_body = ''
+        self.text_body = ''
+        self.attachment = None
+        self.attachment_filename = "certificate.png"
+        self.encode_seconds = 0.0
+        self.cache_hit = None
+        self.warning = None
+        self.message = None
+        self.message_bytes = None
+        self.result = None
+
 def main():
     """Main execution flow."""
     print("=" * 70)
@@ -1426,18 +3472,52 @@ def main():
     print("=" * 70)
     print()
     
-    # Step 1: Authenticate
-    print("Step 1: Authentication")
-    sheets_service, gmail_service = authorize()
+    # Step 1: Get sheet info or a local file
+    print("Step 1: Recipient Source")
+    sheet_info = prompt_sheet_info()
     
-    # Step 2: Get sheet info
-    print("Step 2: Sheet Configuration")
-    sheet_id = prompt_sheet_info()
-    
-    # Step 3: Fetch data (auto-detects first sheet and fetches all data)
-    print("Step 3: Fetching data from sheet...")
-    headers, data_rows = fetch_rows(sheets_service, sheet_id, None)
-    print(f"✓ Fetched {len(data_rows)} rows with {len(headers)} columns\n")
+    # Step 2: Authenticate (local files are read without logging in)
+    creds = None
+    sheets_service = gmail_service = None
+    if sheet_info['path'] is None:
+        print("Step 2: Authentication")
+        creds = load_credentials()
+        sheets_service, gmail_service = authorize(creds)
+    
+    # Step 3: Read the header row (auto-detects first sheet); rows are fetched after mapping
+    print("Step 3: Reading sheet columns...")
+    snapshot = None
+    if sheet_info['path'] is not None:
+        try:
+            row_source = open_row_source(sheet_info['path'])
+        except (OSError, ValueError, ImportError) as e:
+            print(f"ERROR: Could not read {sheet_info['path']}: {e}")
+            sys.exit(1)
+        headers = row_source.headers
+        print(f"✓ Found {len(headers)} columns in {sheet_info['path']}")
+    else:
+        sheet = open_sheet(sheets_service, sheet_info['sheet_id'])
+        headers = sheet['headers']
+        print(f"✓ Found {len(headers)} columns")
+        
+        # A local snapshot of the rows is reused while the spreadsheet is unmodified
+        sheet_cache = SheetSnapshotCache()
+        modified_time = sheet_modified_time(build_service('drive', 'v3', creds), sheet_info['sheet_id'])
+        snapshot = sheet_cache.load(sheet_info['sheet_id'], sheet['title'])
+        if snapshot is not None:
+            age = format_age(time.time() - snapshot['saved_at'])
+            if sheet_info['refresh']:
+                print(f"⟳ Cached copy from {age} ago ignored - re-downloading")
+                snapshot = None
+            elif modified_time is None:
+                print(f"⟳ Could not verify the cached copy from {age} ago - re-downloading")
+                snapshot = None
+            elif snapshot['modified_time'] != modified_time or snapshot['headers'] != headers:
+                print(f"⟳ Sheet changed since the cached copy from {age} ago - re-downloading")
+                snapshot = None
+            else:
+                print(f"✓ Cached copy from {age} ago is up to date")
+    print()
     
     # Step 4: Select template
     print("Step 4: Template Selection")
@@ -1449,40 +3529,83 @@ def main():
     
     # Step 5.5: Get certificate configuration for certificate template
     cert_config = None
+    export_path = None
     if template_key == 'certificate':
         print("Step 5.5: Certificate Configuration")
         cert_config = prompt_certificate_config()
-    
-    # Convert rows to dictionaries
-    rows_data = []
-    for row in data_rows:
-        row_dict = {}
-        for field, col_idx in field_mapping.items():
-            if col_idx < len(row):
-                row_dict[field] = row[col_idx].strip()
-            else:
-                row_dict[field] = ''
-        
-        # Combine FirstName and LastName into Name if needed
-        if 'FirstName' in row_dict and 'LastName' in row_dict and 'Name' not in row_dict:
-            first = row_dict.get('FirstName', '').strip()
-            last = row_dict.get('LastName', '').strip()
-            row_dict['Name'] = f"{first} {last}".strip()
-        
-        rows_data.append(row_dict)
+        export_path = prompt_export_mode()
+    
+    # Fetch only the mapped columns; later pages load in the background
+    if sheet_info['path'] is not None:
+        sheet_rows = row_source
+    elif snapshot is not None and snapshot_covers(snapshot, field_mapping.values()):
+        sheet_rows = SnapshotRowSource(snapshot)
+        print("✓ Reading rows from the sheet cache\n")
+    else:
+        print("Fetching data from sheet...")
+        columns = sorted(set(field_mapping.values()))
+        snapshot_writer = None
+        if modified_time is not None:
+            snapshot_writer = sheet_cache.writer(sheet_info['sheet_id'], sheet['title'], modified_time,
+                                                 headers, columns)
+        sheet_rows = stream_rows(sheets_service, sheet_info['sheet_id'], sheet, sheet_info['page_size'],
+                                 columns=columns, snapshot_writer=snapshot_writer)
+        column_note = f"{len(sheet_rows.columns)} of {len(headers)} columns"
+        if len(sheet_rows.first_page) < sheet_rows.page_size:
+            print(f"✓ Fetched {len(sheet_rows.first_page)} rows ({column_note})\n")
+        else:
+            print(f"✓ Fetched first {len(sheet_rows.first_page)} rows ({column_note}, "
+                  f"more pages load while sending)\n")
+    
+    # Convert rows to dictionaries as they arrive
+    # The certificate format is a run-wide field so the email text can name it
+    row_constants = {'CertificateFormat': cert_config.get('output_format', 'png')} if cert_config else None
+    row_layout = RowLayout(sheet_rows.field_positions(field_mapping), row_constants)
+    rows_data = map(row_layout.record, sheet_rows)
+    
+    # Export-only mode: write certificates to disk and stop
+    if export_path:
+        print(f"Step 6: Exporting certificates to {export_path}")
+        print("-" * 70)
+        export_counts = export_certificates(rows_data, cert_config, export_path)
+        print()
+        print("=" * 70)
+        print("SUMMARY")
+        print("=" * 70)
+        print(f"Total Rows Processed: {sum(export_counts.values())}")
+        print(f"Exported: {export_counts['exported']}")
+        print(f"Failed: {export_counts['failed']}")
+        print(f"Skipped (no name): {export_counts['skipped']}")
+        print(f"Certificates saved to: {export_path}")
+        print("=" * 70)
+        return
     
     # Step 6: Options
     print("Step 6: Configuration")
     options = prompt_options()
     
+    # Sending through Gmail needs a login even when recipients come from a local file
+    if creds is None and not options['dry_run'] and not options.get('smtp'):
+        print("Authentication (required to send through Gmail)")
+        creds = load_credentials()
+        sheets_service, gmail_service = authorize(creds)
+    
     # Filter by email if specified
     if options['filter_email']:
-        rows_data = [r for r in rows_data if r.get('Email', '').lower() == options['filter_email'].lower()]
-        print(f"Filtered to {len(rows_data)} rows matching {options['filter_email']}\n")
+        filter_email = options['filter_email'].lower()
+        rows_data = (r for r in rows_data if r.get('Email', '').lower() == filter_email)
+        print(f"Filtering to rows matching {options['filter_email']}\n")
+    
+    # The first page is enough to preview and to find the shared template content
+    head_size = sheet_info.get('page_size', SHEET_PAGE_SIZE)
+    head_rows = list(islice(rows_data, head_size))
+    rows_data = chain(head_rows, rows_data)
+    # A short first page means every row is already loaded
+    total_rows = len(head_rows) if len(head_rows) < head_size else None
     
     # Step 7: Preview
     print("Step 7: Preview")
-    preview_messages(rows_data, template_key, options['custom_subject'])
+    preview_messages(head_rows, template_key, options['custom_subject'])
     
     # Step 8: Confirm
     print("Step 8: Confirmation")
@@ -1498,82 +3621,204 @@ def main():
     init_log(options['log_path'])
     
     # Counters
-    counts = {'sent': 0, 'failed': 0, 'skipped': 0, 'dry_run': 0}
-    
-    for idx, row_dict in enumerate(rows_data, 1):
-        email = row_dict.get('Email', '').strip()
-        
-        # Validate
-        is_valid, error_reason = validate_row(row_dict, template_key)
-        if not is_valid:
-            print(f"[{idx}/{len(rows_data)}] SKIPPED {email}: {error_reason}")
-            log_result(options['log_path'], email, '', 'SKIPPED', None, error_reason, template_key)
-            counts['skipped'] += 1
-            continue
-        
-        # Render
-        subject = render_subject(row_dict, template_key, options['custom_subject'])
-        html_body, text_body = render_email(row_dict, template_key)
-        
-        # Generate certificate if needed
-        certificate_attachment = None
-        if template_key == 'certificate' and cert_config:
+    counts = {'sent': 0, 'failed': 0, 'skipped': 0, 'dry_run': 0, 'bytes_sent': 0}
+    upload_threshold = options.get('upload_threshold_kb', GMAIL_UPLOAD_THRESHOLD // 1024) * 1024
+    
+    # Pre-render the parts of the templates that are the same for every recipient
+    campaign = CampaignRenderer(head_rows, template_key)
+    if campaign.enabled:
+        varying = ', '.join(sorted(campaign.varying_placeholders)) or 'none'
+        print(f"Pre-rendered shared template content (per-recipient fields: {varying})")
+    elif head_rows:
+        print("⚠ Shared template cache failed verification - rendering each email in full")
+    
+    # Load the certificate template and font once for the whole run,
+    # or hand rendering to a pool of worker processes
+    cert_renderer = None
+    cert_pool = None
+    cert_workers = 1
+    cert_format = CERTIFICATE_OUTPUT_FORMATS['png']
+    cert_stats = {'count': 0, 'bytes': 0, 'encode_seconds': 0.0, 'cache_hits': 0, 'cache_misses': 0}
+    if template_key == 'certificate' and cert_config:
+        cert_format = CERTIFICATE_OUTPUT_FORMATS[cert_config.get('output_format', 'png')]
+        render_workers = cert_config.get('render_workers', 1)
+        if render_workers > 1:
+            cert_pool = ProcessPoolExecutor(max_workers=render_workers, initializer=_init_certificate_worker,
+                                            initargs=(cert_config,))
+            cert_workers = render_workers
+            print(f"Rendering certificates with {render_workers} worker processes")
+        else:
             try:
-                name = row_dict.get('Name', 'Unknown')
-                certificate_attachment = generate_certificate(
-                    cert_config['template_path'],
-                    name,
-                    cert_config.get('text_position'),
-                    cert_config['font_size'],
-                    cert_config['font_color'],
-                    auto_position=cert_config.get('auto_position', False),
-                    detected_line_y=cert_config.get('detected_line_y'),
-                    vertical_offset=cert_config.get('vertical_offset', 0)
-                )
-                attachment_filename = f"certificate_{name.upper().replace(' ', '_')}.png"
+                cert_renderer = CertificateRenderer.from_config(cert_config)
             except Exception as e:
-                print(f"⚠ Warning: Could not generate certificate for {name}: {e}")
-                attachment_filename = "certificate.png"
+                print(f"⚠ Warning: Could not load certificate template: {e}")
+    
+    # Only rows that actually call the API wait for the rate limiter
+    limiter = AdaptiveRateLimiter(options.get('send_rate', 1.25), options.get('burst', 1))
+    
+    # Transient errors (429/5xx/timeouts) are retried with backoff; each one also slows the limiter
+    retry_policy = RetryPolicy(options.get('max_retries', 5), budget=options.get('retry_budget', 200))
+    note_retry = lambda error: limiter.record_result(False, error)
+    
+    batch_size = 1 if options['dry_run'] else options.get('batch_size', 1)
+    sender = None
+    smtp_pool = None
+    smtp_config = options.get('smtp')
+    if options['dry_run'] or batch_size > 1:
+        pass
+    elif smtp_config:
+        smtp_pool = SmtpConnectionPool(smtp_config['host'], smtp_config['port'], smtp_config['username'],
+                                       smtp_config['password'], smtp_config['security'],
+                                       smtp_config['pool_size'], options['from_address'])
+        sender = SmtpSender(smtp_pool, retry_policy=retry_policy, on_retry=note_retry)
+        print(f"Sending via SMTP {smtp_config['host']}:{smtp_config['port']} "
+              f"over {smtp_config['pool_size']} pooled connections")
+    elif options.get('send_transport') == 'async':
+        async_concurrency = options.get('async_concurrency', 10)
+        sender = AsyncSender(creds, async_concurrency, retry_policy=retry_policy, on_retry=note_retry)
+        print(f"Sending over async HTTP with up to {async_concurrency} concurrent requests")
+    else:
+        send_workers = options.get('send_workers', 1)
+        sender = GmailSender(creds, send_workers, send_fn=lambda service, message: send_gmail_with_retries(
+            service, message, retry_policy, on_retry=note_retry))
+        if send_workers > 1:
+            print(f"Sending with {send_workers} concurrent threads")
+    
+    # Each row moves through validate -> render -> certificate -> build -> send -> log
+    def validate_stage(job: SendJob) -> SendJob:
+        job.email = job.row.get('Email', '').strip()
+        is_valid, error_reason = validate_row(job.row, template_key)
+        if not is_valid:
+            job.skip_reason = error_reason
+        return job
+    
+    def render_stage(job: SendJob) -> SendJob:
+        if job.skip_reason is None:
+            job.subject = render_subject(job.row, template_key, options['custom_subject'])
+            job.html_body, job.text_body = campaign.render_email(job.row)
+        return job
+    
+    def certificate_stage(job: SendJob) -> SendJob:
+        if job.skip_reason is not None or not (cert_renderer or cert_pool):
+            return job
+        name = job.row.get('Name', 'Unknown')
+        try:
+            if cert_pool is not None:
+                data, cert_error, job.encode_seconds, job.cache_hit = cert_pool.submit(
+                    _render_certificate_task, name).result()
+                if cert_error:
+                    raise RuntimeError(cert_error)
+                job.attachment = BytesIO(data)
+            else:
+                job.attachment = cert_renderer.render(name)
+                job.encode_seconds = cert_renderer.last_encode_seconds
+                job.cache_hit = cert_renderer.last_cache_hit
+            job.attachment_filename = certificate_filename(name, cert_format['extension'])
+        except Exception as e:
+            job.attachment = None
+            job.warning = f"⚠ Warning: Could not generate certificate for {name}: {e}"
+        return job
+    
+    def build_stage(job: SendJob) -> SendJob:
+        if job.skip_reason is not None:
+            return job
+        # SMTP sends the MIME message as-is, the Gmail API gets it encoded
+        if smtp_pool is not None:
+            job.message = smtp_pool.prepare(build_mime_message(
+                job.email, job.subject, job.html_body, job.text_body, options['from_address'],
+                job.attachment, job.attachment_filename, cert_format['mime_type']))
+            job.message_bytes = len(job.message[2])
         else:
-            attachment_filename = "certificate.png"
-        
-        # Build message
-        message = build_message(email, subject, html_body, text_body, options['from_address'], 
-                               certificate_attachment, attachment_filename)
-        
-        # Send or dry-run
+            job.message = build_message(job.email, job.subject, job.html_body, job.text_body,
+                                        options['from_address'], job.attachment, job.attachment_filename,
+                                        cert_format['mime_type'], upload_threshold)
+            job.message_bytes = message_size(job.message)
+        return job
+    
+    def send_stage(job: SendJob) -> SendJob:
+        if job.skip_reason is None:
+            limiter.acquire()
+            job.result = sender.send(job.message)
+        return job
+    
+    def send_batch_stage(jobs: List[SendJob]) -> List[SendJob]:
+        ready = [job for job in jobs if job.skip_reason is None]
+        if ready:
+            limiter.acquire(len(ready))
+            results = send_gmail_batch(gmail_service, [job.message for job in ready],
+                                       retry_policy=retry_policy, on_retry=note_retry)
+            for job, result in zip(ready, results):
+                job.result = result
+        return jobs
+    
+    def log_stage(job: SendJob):
+        if job.warning:
+            print(job.warning)
+        if job.skip_reason is not None:
+            report_skipped_row(job.idx, total_rows, job.email, job.skip_reason,
+                               options['log_path'], template_key, counts)
+            return
+        if job.attachment is not None:
+            if job.cache_hit is not None:
+                cert_stats['cache_hits' if job.cache_hit else 'cache_misses'] += 1
+            cert_stats['count'] += 1
+            cert_stats['bytes'] += len(job.attachment.getbuffer())
+            cert_stats['encode_seconds'] += job.encode_seconds
         if options['dry_run']:
-            print(f"[{idx}/{len(rows_data)}] DRY-RUN {email}: {subject[:50]}...")
-            log_result(options['log_path'], email, subject, 'DRY-RUN', None, None, template_key)
+            print(f"{progress_label(job.idx, total_rows)} DRY-RUN {job.email}: {job.subject[:50]}...")
+            log_result(options['log_path'], job.email, job.subject, 'DRY-RUN', None, None, template_key)
             counts['dry_run'] += 1
         else:
-            success, message_id, error = send_gmail(gmail_service, message)
-            if success:
-                print(f"[{idx}/{len(rows_data)}] SENT {email}: {subject[:50]}...")
-                log_result(options['log_path'], email, subject, 'SENT', message_id, None, template_key)
-                counts['sent'] += 1
-            else:
-                print(f"[{idx}/{len(rows_data)}] FAILED {email}: {error}")
-                log_result(options['log_path'], email, subject, 'FAILED', None, error, template_key)
-                counts['failed'] += 1
-        
-        # Throttle
-        if idx < len(rows_data):
-            time.sleep(options['throttle'])
+            report_send_result(job.idx, total_rows, job.email, job.subject, job.result,
+                               options['log_path'], template_key, counts, limiter, job.message_bytes)
+    
+    stages = [
+        PipelineStage('validate', validate_stage),
+        PipelineStage('render', render_stage, options.get('render_workers', 1)),
+        PipelineStage('certificate', certificate_stage, cert_workers),
+        PipelineStage('build', build_stage, options.get('build_workers', 1)),
+    ]
+    if batch_size > 1:
+        stages.append(PipelineStage('send', send_batch_stage, batch_size=batch_size))
+    elif sender is not None:
+        stages.append(PipelineStage('send', send_stage, sender.workers))
+    
+    pipeline = Pipeline(stages, PIPELINE_QUEUE_SIZE)
+    try:
+        pipeline.run((SendJob(idx, row_dict) for idx, row_dict in enumerate(rows_data, 1)), log_stage)
+    finally:
+        if sender is not None:
+            sender.close()
+        if cert_pool is not None:
+            cert_pool.shutdown()
     
     # Step 10: Summary
     print()
     print("=" * 70)
     print("SUMMARY")
     print("=" * 70)
-    print(f"Total Rows Processed: {len(rows_data)}")
+    print(f"Total Rows Processed: {pipeline.sink_stage.items}")
     if options['dry_run']:
         print(f"Dry-Run: {counts['dry_run']}")
     else:
         print(f"Sent: {counts['sent']}")
         print(f"Failed: {counts['failed']}")
+        print(f"Retries: {retry_policy.retries_used} (budget {retry_policy.budget})")
+        if counts['sent']:
+            print(f"Data Sent: {counts['bytes_sent'] / 1024 / 1024:.2f} MB "
+                  f"(avg {counts['bytes_sent'] / counts['sent'] / 1024:.1f} KB per email)")
     print(f"Skipped: {counts['skipped']}")
+    if cert_stats['count']:
+        avg_kb = cert_stats['bytes'] / cert_stats['count'] / 1024
+        avg_ms = cert_stats['encode_seconds'] / cert_stats['count'] * 1000
+        print(f"Certificates: {cert_stats['count']} ({cert_format['label']}, "
+              f"avg {avg_kb:.0f} KB, avg encode {avg_ms:.0f} ms)")
+    if cert_stats['cache_hits'] or cert_stats['cache_misses']:
+        print(f"Certificate Cache: {cert_stats['cache_hits']} hits, {cert_stats['cache_misses']} misses")
     print(f"Log saved to: {options['log_path']}")
+    print("-" * 70)
+    print(f"Pipeline ({pipeline.elapsed_seconds:.1f}s):")
+    pipeline.print_stats()
     print("=" * 70)
 
 if __name__ == '__main__':